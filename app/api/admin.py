@@ -1,33 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.schemas.schemas import OrderResponse, DailySales
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import get_db, get_read_db
+from app.database.async_database import get_async_db, get_async_read_db
+from app.schemas.schemas import OrderResponse, DailySales, UserResponse, UserAdminUpdate
 from app.schemas.admin_schemas import (
     StaffCreate, StaffUpdate, StaffResponse,
-    AttendanceCreate, AttendanceResponse,
-    ExpenseCreate, ExpenseUpdate, ExpenseResponse,
+    AttendanceCreate, AttendanceResponse, AttendanceBulkCreate,
+    ExpenseCreate, ExpenseUpdate, ExpenseResponse, ExpensePage, ExpenseImportResult,
     DashboardStats, GraphDataPoint, FinanceSummary,
     BudgetCreate, BudgetUpdate, BudgetResponse, TaskCreate, TaskUpdate, TaskResponse,
-    MilestoneCreate, MilestoneUpdate, MilestoneResponse, DetailedFinanceReport
+    TaskPage, TodayBoard, MilestonePage,
+    MilestoneCreate, MilestoneUpdate, MilestoneResponse, DetailedFinanceReport,
+    ProfitLossReport, MenuItemSales, CategorySales, StaffPerformance
 )
-from app.services import order_service, admin_service
+from app.services import order_service, admin_service, export_service, analytics_service, user_service, token_service
 from app.auth.deps import check_role
 from app.models.models import UserRole
 from typing import List, Optional
+from datetime import date, datetime, timedelta
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 # Dashboard Endpoints
 @router.get("/dashboard/stats", response_model=DashboardStats)
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
-    return admin_service.get_dashboard_stats(db)
+    return await admin_service.get_dashboard_stats_async(db)
 
 @router.get("/dashboard/graph", response_model=List[GraphDataPoint])
 def get_revenue_graph(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
     return admin_service.get_revenue_graph_data(db)
@@ -35,23 +41,33 @@ def get_revenue_graph(
 # Order Management
 @router.get("/orders", response_model=List[OrderResponse])
 def get_all_orders(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin", "staff"]))
 ):
     return order_service.get_all_orders(db)
 
 @router.patch("/orders/update/{order_id}", response_model=OrderResponse)
-def update_order_status(
+async def update_order_status(
     order_id: int,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     admin: dict = Depends(check_role(["admin", "staff"]))
 ):
-    db_order = order_service.update_order_status(db, order_id=order_id, status=status)
+    db_order = await order_service.update_order_status_async(db, order_id=order_id, status=status)
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
     return db_order
 
+@router.post("/orders/archive")
+def archive_orders(
+    older_than_days: int = Query(order_service.ORDER_ARCHIVE_AFTER_DAYS, ge=order_service.ORDER_ARCHIVE_MIN_DAYS),
+    batch_size: int = Query(order_service.ORDER_ARCHIVE_BATCH_SIZE, ge=1, le=10000),
+    max_batches: Optional[int] = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return order_service.archive_orders(db, older_than_days, batch_size, max_batches)
+
 @router.patch("/orders/assign/{order_id}", response_model=OrderResponse)
 def assign_order_staff(
     order_id: int,
@@ -64,13 +80,54 @@ def assign_order_staff(
         raise HTTPException(status_code=404, detail="Order not found")
     return db_order
 
+# User Management
+@router.get("/users", response_model=List[UserResponse])
+def get_users(
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return user_service.get_users(db)
+
+@router.patch("/users/{user_id}", response_model=UserResponse)
+def update_user(
+    user_id: int,
+    user_data: UserAdminUpdate,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    db_user = user_service.update_user(db, user_id, user_data)
+    if not db_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.delete("/users/{user_id}")
+def delete_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    if not user_service.delete_user(db, user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    return {"message": "User deleted successfully"}
+
+@router.post("/users/{user_id}/sign-out")
+def sign_out_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    token_service.revoke_user_sessions(db, user_id)
+    return {"message": "User signed out"}
+
 # Staff Management
 @router.get("/staff", response_model=List[StaffResponse])
 def get_all_staff(
-    db: Session = Depends(get_db),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
-    return admin_service.get_all_staff(db)
+    return admin_service.get_all_staff(db, start_date, end_date)
 
 @router.post("/staff", response_model=StaffResponse)
 def create_staff(
@@ -111,27 +168,55 @@ def record_attendance(
 ):
     return admin_service.record_attendance(db, attendance_data.staff_id, attendance_data.status)
 
+@router.post("/attendance/bulk", response_model=List[AttendanceResponse])
+def record_bulk_attendance(
+    attendance_data: AttendanceBulkCreate,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return admin_service.record_bulk_attendance(db, attendance_data.entries, attendance_data.day)
+
 # Finance & Database
 @router.get("/finance/summary", response_model=FinanceSummary)
 def get_finance_summary(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
     return admin_service.get_finance_summary(db)
 
 @router.get("/finance/report", response_model=DetailedFinanceReport)
 def get_finance_report(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
     return admin_service.get_detailed_finance_report(db)
 
-@router.get("/finance/expenses", response_model=List[ExpenseResponse])
+@router.get("/finance/pnl", response_model=ProfitLossReport)
+def get_profit_and_loss(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    period: str = Query("month", pattern="^(day|week|month|year)$"),
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    today = date.today()
+    end_date = end_date or today
+    start_date = start_date or end_date.replace(day=1)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    return admin_service.get_profit_and_loss(db, start_date, end_date, period)
+
+@router.get("/finance/expenses", response_model=ExpensePage)
 def get_expenses(
-    db: Session = Depends(get_db),
+    cursor: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
-    return admin_service.get_expenses(db)
+    return admin_service.get_expenses(db, cursor, limit, category, start_date, end_date)
 
 @router.post("/finance/expenses", response_model=ExpenseResponse)
 def create_expense(
@@ -141,6 +226,17 @@ def create_expense(
 ):
     return admin_service.create_expense(db, expense_data)
 
+@router.post("/finance/expenses/import", response_model=ExpenseImportResult)
+def import_expenses(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    try:
+        return admin_service.import_expenses(db, file.file)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid CSV: {e}")
+
 @router.patch("/finance/expenses/{expense_id}", response_model=ExpenseResponse)
 def update_expense(
     expense_id: int,
@@ -190,12 +286,28 @@ def delete_budget(
     return {"message": "Budget deleted"}
 
 # Planning routes
-@router.get("/tasks", response_model=List[TaskResponse])
+@router.get("/tasks", response_model=TaskPage)
 def get_tasks(
-    db: Session = Depends(get_db),
+    is_completed: Optional[bool] = None,
+    assigned_staff_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin", "staff"]))
+):
+    return admin_service.get_tasks(
+        db, is_completed, assigned_staff_id, due_after, due_before, overdue, cursor, limit
+    )
+
+@router.get("/tasks/today", response_model=TodayBoard)
+def get_today_board(
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin", "staff"]))
 ):
-    return admin_service.get_tasks(db)
+    return admin_service.get_today_board(db)
 
 @router.post("/tasks", response_model=TaskResponse)
 def create_task(
@@ -225,13 +337,22 @@ def delete_task(
     if not admin_service.delete_task(db, task_id): raise HTTPException(status_code=404, detail="Task not found")
     return {"message": "Task deleted"}
 
-@router.get("/milestones", response_model=List[MilestoneResponse])
+@router.get("/milestones", response_model=MilestonePage)
 def get_milestones(
     milestone_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    is_completed: Optional[bool] = None,
+    assigned_staff_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    cursor: Optional[int] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin", "staff"]))
 ):
-    return admin_service.get_milestones(db, milestone_type)
+    return admin_service.get_milestones(
+        db, milestone_type, is_completed, assigned_staff_id, due_after, due_before, overdue, cursor, limit
+    )
 
 @router.post("/milestones", response_model=MilestoneResponse)
 def create_milestone(
@@ -261,10 +382,83 @@ def delete_milestone(
     if not admin_service.delete_milestone(db, milestone_id): raise HTTPException(status_code=404, detail="Milestone not found")
     return {"message": "Milestone deleted"}
 
+# Menu Analytics
+@router.get("/analytics/menu/top-sellers", response_model=List[MenuItemSales])
+def get_top_sellers(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return analytics_service.get_item_sales(db, start_date, end_date, order_by="quantity", limit=limit)
+
+@router.get("/analytics/menu/revenue-by-item", response_model=List[MenuItemSales])
+def get_revenue_by_item(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return analytics_service.get_item_sales(db, start_date, end_date, order_by="revenue")
+
+@router.get("/analytics/menu/revenue-by-category", response_model=List[CategorySales])
+def get_revenue_by_category(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return analytics_service.get_category_sales(db, start_date, end_date)
+
+@router.post("/analytics/menu/backfill")
+def backfill_menu_analytics(
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    return analytics_service.backfill_menu_item_sales(db)
+
+@router.get("/analytics/staff", response_model=List[StaffPerformance])
+def get_staff_performance(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db),
+    admin: dict = Depends(check_role(["admin"]))
+):
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=6)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be before end_date")
+    if (end_date - start_date).days >= analytics_service.STAFF_PERFORMANCE_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range is limited to {analytics_service.STAFF_PERFORMANCE_MAX_DAYS} days"
+        )
+    return analytics_service.get_staff_performance(db, start_date, end_date)
+
+# Exports
+@router.get("/export/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    admin: dict = Depends(check_role(["admin"]))
+):
+    if dataset not in export_service.EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"{dataset}.{'csv' if format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        export_service.stream_export(dataset, format, start_date, end_date),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # Legacy / Simple Stats
 @router.get("/sales", response_model=DailySales)
 def get_daily_sales(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: dict = Depends(check_role(["admin"]))
 ):
     return order_service.get_daily_sales(db)
@@ -1,37 +1,78 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database.database import get_db
-from app.schemas.schemas import UserCreate, UserResponse, Token
-from app.services import user_service
+from app.schemas.schemas import UserCreate, UserResponse, Token, RefreshRequest, LogoutRequest
+from app.services import user_service, token_service
 from app.auth import security
-from app.auth.deps import get_current_active_user
+from app.auth.deps import get_current_active_user, oauth2_scheme, forget_token
 from app.models.models import User
-from datetime import timedelta
+from typing import Optional
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+hashing_unavailable = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Authentication is busy, please retry shortly",
+    headers={"Retry-After": "1"},
+)
+
+# These handlers are async so that waiting on the password-hash pool doesn't hold a threadpool
+# worker; their DB calls are pushed to the threadpool explicitly.
 @router.post("/register", response_model=UserResponse)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = user_service.get_user_by_email(db, email=user.email)
+async def register(user: UserCreate, db: Session = Depends(get_db)):
+    db_user = await run_in_threadpool(user_service.get_user_by_email, db, user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    return user_service.create_user(db=db, user=user)
+    try:
+        hashed_password = await security.get_password_hash_async(user.password)
+    except security.HashingSaturated:
+        raise hashing_unavailable
+    return await run_in_threadpool(user_service.create_user, db, user, hashed_password)
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = user_service.get_user_by_email(db, email=form_data.username)
-    if not user or not security.verify_password(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+    user = await run_in_threadpool(user_service.get_user_by_email, db, form_data.username)
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await security.verify_password_async(form_data.password, user.hashed_password)
+        except security.HashingSaturated:
+            raise hashing_unavailable
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        await run_in_threadpool(user_service.update_password_hash, db, user, new_hash)
+
+    return await run_in_threadpool(token_service.create_session, db, user)
+
+@router.post("/refresh", response_model=Token)
+def refresh(body: RefreshRequest, db: Session = Depends(get_db)):
+    tokens = token_service.rotate_refresh_token(db, body.refresh_token)
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return tokens
 
-    access_token = security.create_access_token(
-        data={"sub": user.email}
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+@router.post("/logout")
+def logout(
+    body: LogoutRequest = LogoutRequest(),
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(oauth2_scheme)
+):
+    payload = security.decode_access_token(token) if token else None
+    token_service.logout(db, payload, body.refresh_token)
+    if token:
+        forget_token(token)
+    return {"message": "Logged out"}
 
 @router.post("/google")
 def google_login():
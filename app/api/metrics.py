@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from app import metrics
+import ipaddress
+import os
+import secrets
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Scrapers must connect from one of these networks or send `Authorization: Bearer <METRICS_TOKEN>`
+METRICS_ALLOWED_IPS = [
+    ipaddress.ip_network(net.strip(), strict=False)
+    for net in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if net.strip()
+]
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+router = APIRouter(tags=["metrics"])
+
+def _client_allowed(request: Request):
+    try:
+        address = ipaddress.ip_address(request.client.host)
+    except (AttributeError, ValueError):
+        return False
+    return any(address in network for network in METRICS_ALLOWED_IPS)
+
+def _token_valid(request: Request):
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return bool(METRICS_TOKEN) and scheme.lower() == "bearer" and secrets.compare_digest(token, METRICS_TOKEN)
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(request: Request):
+    if not METRICS_ENABLED or not (_client_allowed(request) or _token_valid(request)):
+        raise HTTPException(status_code=404)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
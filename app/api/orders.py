@@ -1,38 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.database import get_db
+from app.database.async_database import get_async_db
 from app.schemas.schemas import OrderCreate, OrderResponse
 from app.services import order_service
-from app.auth.deps import get_current_user, get_current_active_user
+from app.auth.deps import Principal, get_current_principal, get_current_active_user
+from app.middleware.etag import not_modified, version_etag
 from app.models.models import User
 from typing import List, Optional
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 @router.post("/create", response_model=OrderResponse)
-def create_order(
+async def create_order(
     order: OrderCreate,
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user) # Optional for guest checkout
+    db: AsyncSession = Depends(get_async_db),
+    principal: Optional[Principal] = Depends(get_current_principal) # Optional for guest checkout
 ):
-    user_id = current_user.id if current_user else None
-    return order_service.create_order(db=db, order_data=order, user_id=user_id)
+    user_id = principal.id if principal else None
+    return await order_service.create_order_async(db=db, order_data=order, user_id=user_id)
 
 # Separate endpoint for actual guest checkout without even trying to get user
 @router.post("/guest-create", response_model=OrderResponse)
-def create_guest_order(order: OrderCreate, db: Session = Depends(get_db)):
-    return order_service.create_order(db=db, order_data=order, user_id=None)
+async def create_guest_order(order: OrderCreate, db: AsyncSession = Depends(get_async_db)):
+    return await order_service.create_order_async(db=db, order_data=order, user_id=None)
 
+# Customers read these right after checkout, so they stay on the primary rather than a replica
 @router.get("/status/{order_id}", response_model=OrderResponse)
-def get_order_status(order_id: int, db: Session = Depends(get_db)):
-    db_order = order_service.get_order(db, order_id=order_id)
+async def get_order_status(order_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_order = await order_service.get_order_async(db, order_id=order_id, include_archive=True)
     if not db_order:
         raise HTTPException(status_code=404, detail="Order not found")
     return db_order
 
 @router.get("/user", response_model=List[OrderResponse])
 def get_my_orders(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
+    etag = version_etag("orders", current_user.id, order_service.get_user_orders_version(db, current_user.id))
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["etag"] = etag
     return order_service.get_user_orders(db, user_id=current_user.id)
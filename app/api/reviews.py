@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from app.database.database import get_db
+from app.database.async_database import get_async_db, get_async_read_db
 from app.schemas.schemas import ReviewCreate, ReviewResponse, ReviewFeed, ReviewCommentCreate, ReviewCommentResponse
 from app.services import review_service
-from app.auth.deps import get_current_user, check_role
+from app.auth.deps import Principal, get_current_principal, get_current_user, check_role
+from app.middleware.etag import not_modified, version_etag
 from app.models.models import User
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
@@ -15,8 +19,8 @@ async def submit_review(
     text: str = Form(...),
     guest_name: Optional[str] = Form(None),
     files: List[UploadFile] = File([]),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    principal: Optional[Principal] = Depends(get_current_principal)
 ):
     if stars < 1 or stars > 5:
         raise HTTPException(status_code=400, detail="Stars must be between 1 and 5")
@@ -26,27 +30,29 @@ async def submit_review(
     image_urls = []
     for file in files:
         if file.content_type.startswith("image/"):
-            url = review_service.save_upload_file(file)
+            url = await run_in_threadpool(review_service.save_upload_file, file)
             image_urls.append(url)
 
     review_data = ReviewCreate(stars=stars, text=text, guest_name=guest_name)
-    user_id = current_user.id if current_user else None
-
-    db_review = review_service.create_review(db, review_data, user_id, image_urls)
+    user_id = principal.id if principal else None
 
-    # Return as response schema
-    feed_single = review_service.get_reviews_feed(db, page=1, limit=1, current_user_id=user_id)
-    return feed_single["reviews"][0]
+    return await review_service.create_review_async(db, review_data, user_id, image_urls)
 
 @router.get("/feed", response_model=ReviewFeed)
-def get_feed(
+async def get_feed(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db),
-    current_user: Optional[User] = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_read_db),
+    principal: Optional[Principal] = Depends(get_current_principal)
 ):
-    user_id = current_user.id if current_user else None
-    return review_service.get_reviews_feed(db, page, limit, user_id)
+    user_id = principal.id if principal else None
+    etag = version_etag("feed", page, limit, user_id, await review_service.get_reviews_feed_version_async(db, page, limit))
+    if cached := not_modified(request, etag):
+        return cached
+    response.headers["etag"] = etag
+    return await review_service.get_reviews_feed_async(db, page, limit, user_id)
 
 @router.post("/{review_id}/like")
 def like_review(
@@ -2,13 +2,63 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
+from dataclasses import dataclass
+from typing import Optional
+from app.cache import TTLCache
+from app.metrics import register_cache
+from app.auth.revocation import revocation_filter
 from app.database.database import get_db
 from app.models.models import User
-from .security import SECRET_KEY, ALGORITHM
+from .security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+import hashlib
+import os
+import threading
+import time
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "300"))
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    email: str
+    role: str
+    token_id: Optional[str] = None
+    issued_at: float = 0
+
+# Verified principals keyed by token digest
+principal_cache = TTLCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+register_cache("principal", principal_cache)
+
+# user_id -> time of the last role change or deletion; older token claims for them are not trusted
+_invalidated_users = {}
+_invalidated_lock = threading.Lock()
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def invalidate_principal(user_id: int):
+    now = time.time()
+    with _invalidated_lock:
+        _invalidated_users[user_id] = now
+        # Tokens issued before this cutoff have expired anyway
+        cutoff = now - ACCESS_TOKEN_EXPIRE_MINUTES * 60
+        for uid in [uid for uid, at in _invalidated_users.items() if at < cutoff]:
+            del _invalidated_users[uid]
+    principal_cache.discard_where(lambda p: p.id == user_id)
+
+def forget_token(token: str):
+    principal_cache.pop(_token_key(token))
+
+def _claims_are_current(payload: dict) -> bool:
+    if payload.get("uid") is None or payload.get("role") is None:
+        return False
+    invalidated_at = _invalidated_users.get(payload["uid"])
+    return invalidated_at is None or payload.get("iat", 0) > invalidated_at
+
+def get_current_principal(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
     if not token:
         return None
     credentials_exception = HTTPException(
@@ -16,6 +66,13 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    key = _token_key(token)
+    principal = principal_cache.get(key)
+    if principal is not None:
+        if revocation_filter.is_revoked(principal.token_id, principal.id, principal.issued_at):
+            principal_cache.pop(key)
+            raise credentials_exception
+        return principal
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -24,9 +81,41 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    if _claims_are_current(payload):
+        principal = Principal(
+            id=payload["uid"], email=email, role=payload["role"],
+            token_id=payload.get("jti"), issued_at=payload.get("iat", 0)
+        )
+    else:
+        # Legacy token without claims, or the user changed since it was issued
+        if payload.get("uid") is not None:
+            user = db.query(User).filter(User.id == payload["uid"]).first()
+        else:
+            user = db.query(User).filter(User.email == email).first()
+        if user is None:
+            raise credentials_exception
+        principal = Principal(
+            id=user.id, email=user.email, role=user.role,
+            token_id=payload.get("jti"), issued_at=payload.get("iat", 0)
+        )
+
+    if revocation_filter.is_revoked(principal.token_id, principal.id, principal.issued_at):
         raise credentials_exception
+
+    # Never cache a principal beyond its token's expiry
+    principal_cache.set(key, principal, ttl=payload["exp"] - time.time())
+    return principal
+
+def get_current_user(db: Session = Depends(get_db), principal: Principal = Depends(get_current_principal)):
+    if principal is None:
+        return None
+    user = db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 def get_current_active_user(current_user: User = Depends(get_current_user)):
@@ -39,17 +128,17 @@ def get_current_active_user(current_user: User = Depends(get_current_user)):
     return current_user
 
 def check_role(roles: list):
-    def role_checker(current_user: User = Depends(get_current_user)):
-        if not current_user:
+    def role_checker(principal: Principal = Depends(get_current_principal)):
+        if not principal:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Authentication required",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        if current_user.role not in roles:
+        if principal.role not in roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="The user doesn't have enough privileges"
             )
-        return current_user
+        return principal
     return role_checker
@@ -0,0 +1,118 @@
+from sqlalchemy.orm import Session
+from app.database.database import SessionLocal
+from app.models.models import RevokedToken
+from app.metrics import register_collector
+from datetime import datetime
+import hashlib
+import math
+import os
+import threading
+import time
+
+REVOCATION_FILTER_REFRESH_SECONDS = int(os.getenv("REVOCATION_FILTER_REFRESH_SECONDS", "30"))
+REVOCATION_FILTER_FP_RATE = float(os.getenv("REVOCATION_FILTER_FP_RATE", "0.001"))
+
+class BloomFilter:
+    def __init__(self, capacity: int, fp_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+def user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+class RevocationFilter:
+    """In-memory Bloom filter over the revoked_tokens table.
+
+    A miss means the token is definitely not revoked, so the common case needs no query; a hit
+    is confirmed against the table. The filter is rebuilt from the table every
+    REVOCATION_FILTER_REFRESH_SECONDS so revocations made by other workers are picked up.
+    """
+
+    def __init__(self):
+        self._filter = BloomFilter(1024, REVOCATION_FILTER_FP_RATE)
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.positives = 0
+        self.entries = 0
+
+    def rebuild(self, db: Session = None):
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            keys = [k for (k,) in db.query(RevokedToken.key).filter(RevokedToken.expires_at > datetime.utcnow()).all()]
+        finally:
+            if own_session:
+                db.close()
+        bloom = BloomFilter(max(1024, len(keys) * 2), REVOCATION_FILTER_FP_RATE)
+        for key in keys:
+            bloom.add(key)
+        self._filter = bloom
+        self.entries = len(keys)
+        self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < REVOCATION_FILTER_REFRESH_SECONDS:
+            return
+        if self._lock.acquire(blocking=False):
+            try:
+                self.rebuild()
+            finally:
+                self._lock.release()
+
+    def add(self, key: str):
+        self._filter.add(key)
+        self.entries += 1
+
+    def _confirm(self, key: str):
+        db = SessionLocal()
+        try:
+            return db.query(RevokedToken).filter(
+                RevokedToken.key == key,
+                RevokedToken.expires_at > datetime.utcnow()
+            ).first()
+        finally:
+            db.close()
+
+    def is_revoked(self, jti: str, user_id: int, issued_at: float) -> bool:
+        self._ensure_fresh()
+        self.checks += 1
+        if jti and jti in self._filter:
+            self.positives += 1
+            if self._confirm(jti):
+                return True
+        key = user_key(user_id)
+        if key in self._filter:
+            self.positives += 1
+            entry = self._confirm(key)
+            # iat has whole-second precision, so tokens issued in the revocation's own second
+            # (e.g. the fresh login after a password change) stay valid; revoked_at is naive UTC
+            if entry and datetime.utcfromtimestamp(issued_at) < entry.revoked_at.replace(tzinfo=None, microsecond=0):
+                return True
+        return False
+
+    def collect(self):
+        return [
+            ("revocation_filter_entries", "gauge", "Revoked keys loaded into the Bloom filter", [({}, self.entries)]),
+            ("revocation_filter_bytes", "gauge", "Size of the Bloom filter bit array", [({}, len(self._filter.bits))]),
+            ("revocation_filter_checks_total", "counter", "Tokens checked against the filter", [({}, self.checks)]),
+            ("revocation_filter_positives_total", "counter", "Filter hits that needed a database check", [({}, self.positives)]),
+        ]
+
+revocation_filter = RevocationFilter()
+register_collector(revocation_filter.collect)
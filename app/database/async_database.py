@@ -0,0 +1,67 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from app.database.database import (
+    SQLALCHEMY_DATABASE_URL, DATABASE_READ_URL, READ_POOL_SIZE, READ_MAX_OVERFLOW,
+    SQLITE_PERFORMANCE_PROFILE, SQLITE_PRAGMAS, configure_sqlite
+)
+from app.database.instrumentation import instrument_engine
+from app.metrics import register_pool
+import os
+
+# Async drivers for the sync URLs: aiosqlite locally, asyncpg for Postgres
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+if ASYNC_DATABASE_URL.startswith("sqlite") and SQLITE_PERFORMANCE_PROFILE:
+    configure_sqlite(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+register_pool("async_primary", async_engine.sync_engine)
+
+def _create_async_read_engine():
+    if DATABASE_READ_URL:
+        return create_async_engine(
+            to_async_url(DATABASE_READ_URL), pool_size=READ_POOL_SIZE, max_overflow=READ_MAX_OVERFLOW
+        )
+
+    url = make_url(ASYNC_DATABASE_URL)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return async_engine
+
+    read_engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:{url.database}?mode=ro&uri=true",
+        pool_size=READ_POOL_SIZE,
+        max_overflow=READ_MAX_OVERFLOW
+    )
+    if SQLITE_PERFORMANCE_PROFILE:
+        read_pragmas = {k: v for k, v in SQLITE_PRAGMAS.items() if k != "journal_mode"}
+        configure_sqlite(read_engine.sync_engine, {**read_pragmas, "query_only": "ON"})
+    return read_engine
+
+async_read_engine = _create_async_read_engine()
+instrument_engine(async_read_engine.sync_engine)
+if async_read_engine is not async_engine:
+    register_pool("async_read", async_read_engine.sync_engine)
+
+# expire_on_commit=False so returned objects stay readable without a lazy (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, expire_on_commit=False, autoflush=False)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
@@ -1,24 +1,102 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from app.database.instrumentation import instrument_engine
+from app.metrics import register_pool
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./malume_nico.db")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "10"))
+READ_MAX_OVERFLOW = int(os.getenv("READ_MAX_OVERFLOW", "10"))
+
+# Connect-time PRAGMAs for SQLite: WAL lets readers run alongside the writer, NORMAL sync is
+# durable across application crashes in WAL mode, and busy_timeout waits out short write locks
+SQLITE_PERFORMANCE_PROFILE = os.getenv("SQLITE_PERFORMANCE_PROFILE", "true").lower() == "true"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536")), # negative means KiB
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    "foreign_keys": "ON",
+}
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def configure_sqlite(target_engine, pragmas: dict = SQLITE_PRAGMAS):
+    event.listen(target_engine, "connect", lambda conn, record: apply_sqlite_pragmas(conn, pragmas))
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
 )
+if SQLALCHEMY_DATABASE_URL.startswith("sqlite") and SQLITE_PERFORMANCE_PROFILE:
+    configure_sqlite(engine)
+instrument_engine(engine)
+register_pool("primary", engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+def _create_read_engine():
+    # Reports and listings get their own pool: a replica when DATABASE_READ_URL is set, or
+    # read-only connections to the same SQLite file, which WAL lets run beside the writer
+    if DATABASE_READ_URL:
+        return create_engine(DATABASE_READ_URL, pool_size=READ_POOL_SIZE, max_overflow=READ_MAX_OVERFLOW)
+
+    url = make_url(SQLALCHEMY_DATABASE_URL)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return engine
+
+    read_engine = create_engine(
+        f"sqlite:///file:{url.database}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        pool_size=READ_POOL_SIZE,
+        max_overflow=READ_MAX_OVERFLOW
+    )
+    if SQLITE_PERFORMANCE_PROFILE:
+        # journal_mode is a property of the file and is set by the primary engine
+        read_pragmas = {k: v for k, v in SQLITE_PRAGMAS.items() if k != "journal_mode"}
+        configure_sqlite(read_engine, {**read_pragmas, "query_only": "ON"})
+    return read_engine
+
+read_engine = _create_read_engine()
+instrument_engine(read_engine)
+if read_engine is not engine:
+    register_pool("read", read_engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 Base = declarative_base()
 
+def dialect_insert(db):
+    # INSERT construct with ON CONFLICT support for the session's backend
+    dialect = db.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
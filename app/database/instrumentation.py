@@ -0,0 +1,47 @@
+from sqlalchemy import event
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+import re
+import time
+
+class QueryStats:
+    """Queries run while handling one request: count, total DB time and statement fingerprints."""
+
+    __slots__ = ("count", "duration", "fingerprints")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def repeated(self, threshold: int):
+        return {sql: n for sql, n in self.fingerprints.items() if n >= threshold}
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+_EXPANDED_IN = re.compile(rf"\((?:\s*{_PLACEHOLDER}\s*,)+\s*{_PLACEHOLDER}\s*\)")
+
+def fingerprint(statement: str) -> str:
+    # Statements are already parameterised; only IN lists vary in shape between calls
+    return _EXPANDED_IN.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_query_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is None or not conn.info.get("query_start"):
+        return
+    stats.count += 1
+    stats.duration += time.perf_counter() - conn.info["query_start"].pop()
+    stats.fingerprints[fingerprint(statement)] += 1
+
+def instrument_engine(target_engine):
+    if event.contains(target_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(target_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target_engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,145 @@
+"""Build resized JPEG and WebP variants of the gallery and banner images.
+
+    python -m app.image_build [--workers 4] [--widths 320,640,960,1280] [--force]
+
+Every JPEG/PNG under assets/img and images/ is resized to each width below its own (plus
+its own width) and encoded as progressive JPEG and WebP in a process pool. Files go to
+IMAGE_BUILD_DIR with a manifest. Runs are incremental: a source is reprocessed only when
+its content or the settings change, and variants of changed or deleted sources are
+removed. The app serves the best variant in place of the original, so restart it after a
+build. Run from the repository root.
+"""
+import argparse
+import hashlib
+import json
+import os
+import posixpath
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from app.static_files import IMAGE_BUILD_DIR, IMAGE_MANIFEST
+
+IMAGE_SOURCE_DIRS = ("assets/img", "images")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+DEFAULT_WIDTHS = (320, 640, 960, 1280)
+JPEG_QUALITY = 80
+WEBP_QUALITY = 78
+
+def _settings(widths):
+    return {"widths": sorted(widths), "jpeg_quality": JPEG_QUALITY, "webp_quality": WEBP_QUALITY}
+
+def _file_hash(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _sources():
+    for top in IMAGE_SOURCE_DIRS:
+        for root, _, files in os.walk(top):
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield posixpath.join(*os.path.normpath(os.path.join(root, name)).split(os.sep))
+
+def _process(source: str, source_hash: str, output: str, settings: dict):
+    # Runs in a worker process
+    from PIL import Image, ImageOps
+
+    # Variant names carry a hash of the source and the settings, so they never change in place
+    tag = hashlib.sha256((source_hash + json.dumps(settings, sort_keys=True)).encode()).hexdigest()[:12]
+    stem = posixpath.splitext(source)[0]
+    variants = []
+
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        width, height = image.size
+        widths = sorted({w for w in settings["widths"] if w < width} | {min(width, max(settings["widths"]))})
+        for target_width in widths:
+            target_height = round(height * target_width / width)
+            resized = image if target_width == width else image.resize((target_width, target_height), Image.LANCZOS)
+            for fmt, ext, options in (
+                ("webp", "webp", {"quality": settings["webp_quality"], "method": 6}),
+                ("jpeg", "jpg", {"quality": settings["jpeg_quality"], "optimize": True, "progressive": True}),
+            ):
+                path = f"{stem}-{target_width}w.{tag}.{ext}"
+                target = os.path.join(output, *path.split("/"))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                frame = resized if fmt == "webp" or resized.mode == "RGB" else resized.convert("RGB")
+                frame.save(target, fmt.upper(), **options)
+                variants.append({
+                    "width": target_width, "height": target_height, "format": fmt,
+                    "path": path, "bytes": os.path.getsize(target)
+                })
+
+    stat = os.stat(source)
+    return source, {
+        "source_hash": source_hash, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+        "width": width, "height": height, "variants": variants
+    }
+
+def _load_manifest(output: str):
+    try:
+        with open(os.path.join(output, IMAGE_MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"settings": None, "images": {}}
+
+def build(output: str = IMAGE_BUILD_DIR, widths=DEFAULT_WIDTHS, workers: int = None, force: bool = False):
+    settings = _settings(widths)
+    previous = _load_manifest(output)
+    reusable = {} if force or previous["settings"] != settings else previous["images"]
+
+    images, pending = {}, []
+    for source in _sources():
+        entry = reusable.get(source)
+        stat = os.stat(source)
+        # Size and mtime unchanged: skip without reading the file
+        if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            images[source] = entry
+            continue
+        source_hash = _file_hash(source)
+        if entry and entry["source_hash"] == source_hash:
+            images[source] = {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            continue
+        pending.append((source, source_hash))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_process, source, source_hash, output, settings) for source, source_hash in pending]
+        for future in as_completed(futures):
+            source, entry = future.result()
+            images[source] = entry
+
+    # Remove variants that no current source refers to
+    current = {v["path"] for entry in images.values() for v in entry["variants"]}
+    removed = 0
+    for entry in previous["images"].values():
+        for variant in entry["variants"]:
+            target = os.path.join(output, *variant["path"].split("/"))
+            if variant["path"] not in current and os.path.exists(target):
+                os.remove(target)
+                removed += 1
+
+    os.makedirs(output, exist_ok=True)
+    with open(os.path.join(output, IMAGE_MANIFEST), "w") as f:
+        json.dump({"settings": settings, "images": dict(sorted(images.items()))}, f, indent=2)
+        f.write("\n")
+    return {"sources": len(images), "processed": len(pending), "removed": removed}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=IMAGE_BUILD_DIR)
+    parser.add_argument("--widths", default=",".join(str(w) for w in DEFAULT_WIDTHS))
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="reprocess every source")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    result = build(args.output, [int(w) for w in args.widths.split(",")], args.workers, args.force)
+    print(
+        f"{result['sources']} images, {result['processed']} processed, {result['removed']} stale "
+        f"variants removed in {time.perf_counter() - started:.1f}s"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Cumulative-on-render histogram; observe() is a bisect and two additions."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class RequestMetrics:
+    """HTTP request counters. Only the event loop thread writes them, so no locks are needed."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.responses = defaultdict(int)       # (method, route, status) -> count
+        self.latency = defaultdict(Histogram)   # (method, route) -> Histogram
+
+request_metrics = RequestMetrics()
+
+# Callables returning (name, type, help, [(labels, value), ...]) for state owned elsewhere
+_collectors = []
+
+def register_collector(collector):
+    _collectors.append(collector)
+
+def register_cache(name: str, cache):
+    # Any cache exposing len(), maxsize, hits and misses, like TTLCache
+    def collect():
+        lookups = cache.hits + cache.misses
+        labels = {"cache": name}
+        return [
+            ("app_cache_entries", "gauge", "Entries held by an in-process cache", [(labels, len(cache))]),
+            ("app_cache_max_entries", "gauge", "Capacity of an in-process cache", [(labels, cache.maxsize)]),
+            ("app_cache_hits_total", "counter", "Cache lookups that found a live entry", [(labels, cache.hits)]),
+            ("app_cache_misses_total", "counter", "Cache lookups that found nothing", [(labels, cache.misses)]),
+            ("app_cache_hit_ratio", "gauge", "Hits over lookups since start", [(labels, cache.hits / lookups if lookups else 0.0)]),
+        ]
+    register_collector(collect)
+
+def register_pool(name: str, target_engine):
+    pool = target_engine.pool
+    if not hasattr(pool, "checkedout"):
+        return
+
+    def collect():
+        labels = {"pool": name}
+        return [
+            ("db_pool_size", "gauge", "Configured connections kept in the pool", [(labels, pool.size())]),
+            ("db_pool_checked_out", "gauge", "Connections currently in use", [(labels, pool.checkedout())]),
+            ("db_pool_checked_in", "gauge", "Idle connections in the pool", [(labels, pool.checkedin())]),
+            ("db_pool_overflow", "gauge", "Connections open beyond the pool size", [(labels, max(pool.overflow(), 0))]),
+        ]
+    register_collector(collect)
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+def _request_families():
+    metrics = request_metrics
+    yield ("http_requests_in_flight", "gauge", "Requests currently being handled", [({}, metrics.in_flight)])
+    yield ("http_responses_total", "counter", "Responses by route and status code", [
+        ({"method": method, "route": route, "status": status}, count)
+        for (method, route, status), count in list(metrics.responses.items())
+    ])
+
+def _render_histograms(lines: list):
+    name = "http_request_duration_seconds"
+    lines.append(f"# HELP {name} Request latency by route")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), histogram in list(request_metrics.latency.items()):
+        base = {"method": method, "route": route}
+        cumulative = 0
+        for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels({**base, 'le': le})} {cumulative}")
+        lines.append(f"{name}_sum{_labels(base)} {histogram.sum}")
+        lines.append(f"{name}_count{_labels(base)} {histogram.count}")
+
+def render() -> str:
+    # Families from several collectors (e.g. one per cache) are merged under one HELP/TYPE
+    families = {}
+    for family in list(_request_families()) + [f for collector in _collectors for f in collector()]:
+        name, kind, help_text, samples = family
+        families.setdefault(name, (kind, help_text, []))[2].extend(samples)
+
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(labels)} {value}")
+    _render_histograms(lines)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,106 @@
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from typing import Optional
+import hashlib
+import os
+
+ETAG_ENABLED = os.getenv("ETAG_ENABLED", "true").lower() == "true"
+# Revalidate every time: the ETag saves the download, not the request
+API_CACHE_CONTROL = "private, no-cache"
+
+def _digest(data: bytes):
+    return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+def _matches(if_none_match: Optional[str], etag: str):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/ prefixes are ignored on both sides
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def version_etag(*parts):
+    """Weak ETag from a cheap version (counts, max ids, request parameters) of an endpoint's data."""
+    return f'W/"v-{_digest(repr(parts).encode())}"'
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 for the request when it already holds `etag`, so the endpoint can skip building the body."""
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"etag": etag, "cache-control": API_CACHE_CONTROL})
+    return None
+
+class ETagMiddleware:
+    """Adds a weak ETag, hashed from the body, to JSON GET responses under the given path prefixes.
+
+    A matching If-None-Match gets an empty 304 instead of the body. Responses that already carry
+    an ETag (set from version_etag by the endpoint) pass through untouched, as does anything
+    that is not a complete 200 application/json response, such as the streamed exports.
+    """
+
+    def __init__(self, app, path_prefixes: tuple = ()):
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not ETAG_ENABLED
+            or scope["method"] != "GET"
+            or not scope["path"].startswith(self.path_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start = None
+        body = []
+        passthrough = False
+
+        async def send_with_etag(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message.get("headers", [])))
+                if message["status"] != 200 or not headers.get("content-type", "").startswith("application/json"):
+                    passthrough = True
+                    await send(message)
+                    return
+                if "etag" in headers:
+                    passthrough = True
+                    if "cache-control" not in headers:
+                        headers["cache-control"] = API_CACHE_CONTROL
+                    await send({**message, "headers": headers.raw})
+                    return
+                start = message
+                return
+
+            if message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+
+                payload = b"".join(body)
+                etag = f'W/"{_digest(payload)}"'
+                headers = MutableHeaders(raw=list(start.get("headers", [])))
+                headers["etag"] = etag
+                if "cache-control" not in headers:
+                    headers["cache-control"] = API_CACHE_CONTROL
+
+                if _matches(if_none_match, etag):
+                    del headers["content-length"]
+                    del headers["content-type"]
+                    await send({**start, "status": 304, "headers": headers.raw})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+
+                await send({**start, "headers": headers.raw})
+                await send({"type": "http.response.body", "body": payload})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
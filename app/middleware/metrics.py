@@ -0,0 +1,41 @@
+from app.metrics import request_metrics
+import time
+
+class MetricsMiddleware:
+    """Counts responses and observes latency per route template (not raw path, to bound label cardinality).
+
+    Requests served by a mounted app (static files) are labelled with the mount path, e.g. "/assets".
+    """
+
+    def __init__(self, app, metrics=request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status = 500
+        root_path = scope.get("root_path", "")
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            route = getattr(scope.get("route"), "path", None)
+            if route is None:
+                # A mount extends root_path by its own path before calling the mounted app
+                mount_path = scope.get("root_path", "")[len(root_path):]
+                route = mount_path or "<unmatched>"
+            metrics.responses[(scope["method"], route, status)] += 1
+            metrics.latency[(scope["method"], route)].observe(time.perf_counter() - started)
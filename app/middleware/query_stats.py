@@ -0,0 +1,92 @@
+from app.database.instrumentation import QueryStats, current_query_stats
+import json
+import logging
+import os
+import time
+
+SQL_INSTRUMENTATION_ENABLED = os.getenv("SQL_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))    # same statement this often in one request looks like N+1
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "500"))
+SQL_LOG_ALL_REQUESTS = os.getenv("SQL_LOG_ALL_REQUESTS", "false").lower() == "true"
+SQL_LOG_STATEMENT_CHARS = 300
+SQL_QUERY_BUDGET_ENFORCE = os.getenv("SQL_QUERY_BUDGET_ENFORCE", "false").lower() == "true"
+
+logger = logging.getLogger("app.sql")
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+class QueryStatsMiddleware:
+    """Collects per-request SQL stats, reports them in Server-Timing and structured logs.
+
+    query_budgets maps (method, route path) to the most queries a request may run. Requests
+    over budget are logged as warnings, or raise QueryBudgetExceeded when
+    SQL_QUERY_BUDGET_ENFORCE is set (test mode).
+    """
+
+    def __init__(self, app, query_budgets: dict = None):
+        self.app = app
+        self.query_budgets = query_budgets or {}
+
+    def _route_path(self, scope):
+        route = scope.get("route")
+        return getattr(route, "path", scope["path"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_INSTRUMENTATION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={elapsed:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            over_budget = self._report(scope, status, stats, (time.perf_counter() - started) * 1000)
+
+        if over_budget and SQL_QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(
+                f"{scope['method']} {self._route_path(scope)} ran {stats.count} queries, "
+                f"budget is {self.query_budgets[(scope['method'], self._route_path(scope))]}"
+            )
+
+    def _report(self, scope, status: int, stats: QueryStats, elapsed_ms: float):
+        route = self._route_path(scope)
+        repeated = stats.repeated(SQL_REPEAT_THRESHOLD)
+        budget = self.query_budgets.get((scope["method"], route))
+        over_budget = budget is not None and stats.count > budget
+
+        record = {
+            "method": scope["method"],
+            "route": route,
+            "status": status,
+            "duration_ms": round(elapsed_ms, 1),
+            "queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 1),
+        }
+        if repeated:
+            record["repeated"] = {sql[:SQL_LOG_STATEMENT_CHARS]: n for sql, n in repeated.items()}
+        if budget is not None:
+            record["query_budget"] = budget
+
+        if repeated or over_budget or elapsed_ms >= SQL_SLOW_REQUEST_MS:
+            logger.warning(json.dumps(record))
+        elif SQL_LOG_ALL_REQUESTS:
+            logger.info(json.dumps(record))
+        return over_budget
@@ -0,0 +1,170 @@
+from collections import OrderedDict
+from app.metrics import register_collector
+import json
+import math
+import os
+import random
+import time
+import weakref
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_DEFAULT_RATE = float(os.getenv("RATE_LIMIT_DEFAULT_RATE", "20"))   # tokens per second per client
+RATE_LIMIT_DEFAULT_BURST = float(os.getenv("RATE_LIMIT_DEFAULT_BURST", "40"))
+# Static files and pages get their own, looser bucket so a page load with its images never uses up
+# the API allowance (many clients behind one NAT address share both)
+RATE_LIMIT_STATIC_RATE = float(os.getenv("RATE_LIMIT_STATIC_RATE", "100"))
+RATE_LIMIT_STATIC_BURST = float(os.getenv("RATE_LIMIT_STATIC_BURST", "400"))
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+RATE_LIMIT_TRUST_PROXY = os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+# Proxies in front of the app that append to X-Forwarded-For; entries left of theirs are client-supplied
+RATE_LIMIT_PROXY_HOPS = int(os.getenv("RATE_LIMIT_PROXY_HOPS", "1"))
+SHED_SOFT_LIMIT = int(os.getenv("SHED_SOFT_LIMIT", "200"))
+SHED_HARD_LIMIT = int(os.getenv("SHED_HARD_LIMIT", "400"))
+
+class TokenBuckets:
+    """Token buckets keyed by (client, scope), stored as (tokens, last_refill) tuples in LRU order.
+
+    A bucket idle long enough to refill completely is indistinguishable from a new one,
+    so it is evicted; the key count is also hard-capped.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+
+    def take(self, key, rate: float, burst: float, now: float):
+        tokens, last = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - last) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        # Seconds until one token is available
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def evict_idle(self, now: float, idle_after: float):
+        while self._buckets:
+            key, (_, last) = next(iter(self._buckets.items()))
+            if now - last < idle_after and len(self._buckets) <= self.max_keys:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self):
+        return len(self._buckets)
+
+class RateLimitMiddleware:
+    """Per-client token buckets, stricter per-route buckets, and in-flight load shedding.
+
+    route_limits maps (method, path) to (rate per second, burst). Paths starting with one of
+    static_prefixes or ending with one of static_suffixes draw from a separate static bucket
+    instead of the default one. Between SHED_SOFT_LIMIT and SHED_HARD_LIMIT concurrent requests,
+    new requests are shed with rising probability; beyond the hard limit all are.
+    """
+
+    def __init__(
+        self,
+        app,
+        route_limits: dict = None,
+        exempt_paths: tuple = ("/health", "/metrics"),
+        static_prefixes: tuple = (),
+        static_suffixes: tuple = ()
+    ):
+        self.app = app
+        self.route_limits = route_limits or {}
+        self.exempt_paths = exempt_paths
+        self.static_prefixes = tuple(static_prefixes)
+        self.static_suffixes = tuple(static_suffixes)
+        self.buckets = TokenBuckets()
+        self.in_flight = 0
+        self.rejected = 0
+        self.shed = 0
+        self._max_refill = max(
+            [RATE_LIMIT_DEFAULT_BURST / RATE_LIMIT_DEFAULT_RATE, RATE_LIMIT_STATIC_BURST / RATE_LIMIT_STATIC_RATE]
+            + [burst / rate for rate, burst in self.route_limits.values()]
+        )
+        self._next_eviction = 0.0
+        _limiters.add(self)
+
+    def _client(self, scope):
+        if RATE_LIMIT_TRUST_PROXY:
+            forwarded = [
+                entry.strip()
+                for name, value in scope.get("headers", []) if name == b"x-forwarded-for"
+                for entry in value.decode("latin-1").split(",")
+            ]
+            if RATE_LIMIT_PROXY_HOPS > 0 and len(forwarded) >= RATE_LIMIT_PROXY_HOPS:
+                return forwarded[-RATE_LIMIT_PROXY_HOPS]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _should_shed(self):
+        if self.in_flight >= SHED_HARD_LIMIT:
+            return True
+        if self.in_flight <= SHED_SOFT_LIMIT:
+            return False
+        return random.random() < (self.in_flight - SHED_SOFT_LIMIT) / (SHED_HARD_LIMIT - SHED_SOFT_LIMIT)
+
+    async def _reject(self, send, status: int, detail: str, retry_after: float):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not RATE_LIMIT_ENABLED or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self._should_shed():
+            self.shed += 1
+            await self._reject(send, 503, "Server is busy, please retry shortly", 1)
+            return
+
+        now = time.monotonic()
+        if now >= self._next_eviction:
+            self.buckets.evict_idle(now, self._max_refill)
+            self._next_eviction = now + 1
+
+        client = self._client(scope)
+        path = scope["path"]
+        if path.startswith(self.static_prefixes) or path.endswith(self.static_suffixes):
+            allowed, retry_after = self.buckets.take(
+                (client, "static"), RATE_LIMIT_STATIC_RATE, RATE_LIMIT_STATIC_BURST, now
+            )
+        else:
+            allowed, retry_after = self.buckets.take(client, RATE_LIMIT_DEFAULT_RATE, RATE_LIMIT_DEFAULT_BURST, now)
+        route_limit = self.route_limits.get((scope["method"], scope["path"]))
+        if allowed and route_limit:
+            allowed, retry_after = self.buckets.take((client, scope["path"]), route_limit[0], route_limit[1], now)
+        if not allowed:
+            self.rejected += 1
+            await self._reject(send, 429, "Too many requests", retry_after)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+# Live middleware instances; Starlette may rebuild the stack, so hold them weakly
+_limiters = weakref.WeakSet()
+
+def _collect():
+    limiters = list(_limiters)
+    return [
+        ("rate_limit_buckets", "gauge", "Client token buckets held in memory", [({}, sum(len(l.buckets) for l in limiters))]),
+        ("rate_limit_max_buckets", "gauge", "Cap on client token buckets", [({}, RATE_LIMIT_MAX_KEYS)]),
+        ("rate_limit_rejected_total", "counter", "Requests rejected with 429", [({}, sum(l.rejected for l in limiters))]),
+        ("rate_limit_shed_total", "counter", "Requests shed with 503 under load", [({}, sum(l.shed for l in limiters))]),
+    ]
+
+register_collector(_collect)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, DateTime, Date, Boolean, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -34,6 +34,25 @@ class User(Base):
 
     orders = relationship("Order", back_populates="user")
 
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    token_hash = Column(String, unique=True, index=True, nullable=False)
+    family_id = Column(String, index=True, nullable=False) # shared by every rotation of one login
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String, unique=True, index=True, nullable=False) # access token jti, or "user:<id>" for a forced sign-out
+    revoked_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
 class MenuItem(Base):
     __tablename__ = "menu_items"
 
@@ -61,10 +80,15 @@ class Staff(Base):
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        Index("ix_attendance_staff_id_date", "staff_id", "date"),
+        UniqueConstraint("staff_id", "day", name="uq_attendance_staff_id_day"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     staff_id = Column(Integer, ForeignKey("staff.id"))
     date = Column(DateTime(timezone=True), server_default=func.now())
+    day = Column(Date, nullable=False, server_default=func.current_date())
     status = Column(String) # present, off
 
     staff = relationship("Staff", back_populates="attendance")
@@ -73,17 +97,17 @@ class Order(Base):
     __tablename__ = "orders"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     customer_name = Column(String, nullable=False)
     customer_phone = Column(String, nullable=False)
     order_type = Column(String, nullable=False) # Enum values: dine-in, pickup, delivery
-    status = Column(String, default=OrderStatus.PENDING)
+    status = Column(String, default=OrderStatus.PENDING, index=True)
     total = Column(Float, nullable=False)
     delivery_fee = Column(Float, default=0.0)
     address = Column(String, nullable=True)
     instructions = Column(String, nullable=True)
     table_number = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     accepted_at = Column(DateTime(timezone=True), nullable=True)
     prepared_at = Column(DateTime(timezone=True), nullable=True)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
@@ -97,7 +121,7 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"))
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True)
     menu_item_id = Column(Integer, ForeignKey("menu_items.id"))
     quantity = Column(Integer, nullable=False)
     price_at_time = Column(Float, nullable=False)
@@ -105,6 +129,65 @@ class OrderItem(Base):
     order = relationship("Order", back_populates="items")
     menu_item = relationship("MenuItem")
 
+# Completed and cancelled orders past ORDER_ARCHIVE_AFTER_DAYS, moved out of the live tables
+# with their original ids
+class ArchivedOrder(Base):
+    __tablename__ = "orders_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    customer_name = Column(String, nullable=False)
+    customer_phone = Column(String, nullable=False)
+    order_type = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    total = Column(Float, nullable=False)
+    delivery_fee = Column(Float, default=0.0)
+    address = Column(String, nullable=True)
+    instructions = Column(String, nullable=True)
+    table_number = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
+    prepared_at = Column(DateTime(timezone=True), nullable=True)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    assigned_staff_id = Column(Integer, ForeignKey("staff.id"), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    items = relationship("ArchivedOrderItem", back_populates="order")
+
+class ArchivedOrderItem(Base):
+    __tablename__ = "order_items_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    order_id = Column(Integer, ForeignKey("orders_archive.id"), nullable=False, index=True)
+    menu_item_id = Column(Integer, ForeignKey("menu_items.id"))
+    quantity = Column(Integer, nullable=False)
+    price_at_time = Column(Float, nullable=False)
+
+    order = relationship("ArchivedOrder", back_populates="items")
+
+class MenuItemDailySales(Base):
+    __tablename__ = "menu_item_daily_sales"
+    __table_args__ = (
+        UniqueConstraint("menu_item_id", "day", name="uq_menu_item_daily_sales_item_day"),
+        Index("ix_menu_item_daily_sales_day", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    menu_item_id = Column(Integer, ForeignKey("menu_items.id"), nullable=False)
+    day = Column(Date, nullable=False)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
+    order_count = Column(Integer, nullable=False, default=0)
+
+    menu_item = relationship("MenuItem")
+
+class StaffPerformanceCache(Base):
+    __tablename__ = "staff_performance_cache"
+
+    day = Column(Date, primary_key=True)
+    payload = Column(Text, nullable=False) # JSON list of per-staff stats for a closed day
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class Review(Base):
     __tablename__ = "reviews"
 
@@ -122,6 +205,9 @@ class Review(Base):
 
 class ReviewLike(Base):
     __tablename__ = "review_likes"
+    __table_args__ = (
+        Index("ix_review_likes_review_id_user_id", "review_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     review_id = Column(Integer, ForeignKey("reviews.id"))
@@ -134,7 +220,7 @@ class ReviewComment(Base):
     __tablename__ = "review_comments"
 
     id = Column(Integer, primary_key=True, index=True)
-    review_id = Column(Integer, ForeignKey("reviews.id"))
+    review_id = Column(Integer, ForeignKey("reviews.id"), index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     guest_name = Column(String, nullable=True)
     text = Column(String, nullable=False)
@@ -147,13 +233,16 @@ class ReviewImage(Base):
     __tablename__ = "review_images"
 
     id = Column(Integer, primary_key=True, index=True)
-    review_id = Column(Integer, ForeignKey("reviews.id"))
+    review_id = Column(Integer, ForeignKey("reviews.id"), index=True)
     image_url = Column(String, nullable=False)
 
     review = relationship("Review", back_populates="images")
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_date_category", "date", "category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     category = Column(String, nullable=False)
@@ -173,6 +262,10 @@ class Budget(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_is_completed_due_time", "is_completed", "due_time"),
+        Index("ix_tasks_assigned_staff_id_is_completed", "assigned_staff_id", "is_completed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -186,6 +279,10 @@ class Task(Base):
 
 class Milestone(Base):
     __tablename__ = "milestones"
+    __table_args__ = (
+        Index("ix_milestones_is_completed_deadline", "is_completed", "deadline"),
+        Index("ix_milestones_assigned_staff_id_is_completed", "assigned_staff_id", "is_completed"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
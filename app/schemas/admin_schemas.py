@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime
 
 class StaffBase(BaseModel):
     name: str
@@ -38,10 +38,15 @@ class AttendanceCreate(AttendanceBase):
 class AttendanceResponse(AttendanceBase):
     id: int
     date: datetime
+    day: Optional[date] = None
 
     class Config:
         from_attributes = True
 
+class AttendanceBulkCreate(BaseModel):
+    day: Optional[date] = None
+    entries: List[AttendanceBase]
+
 class ExpenseBase(BaseModel):
     category: str
     amount: float
@@ -63,6 +68,21 @@ class ExpenseResponse(ExpenseBase):
     class Config:
         from_attributes = True
 
+class ExpenseImportRow(ExpenseCreate):
+    date: Optional[datetime] = None
+
+class ExpenseImportRejection(BaseModel):
+    row: int
+    reason: str
+
+class ExpenseImportResult(BaseModel):
+    imported: int
+    rejected: List[ExpenseImportRejection]
+
+class ExpensePage(BaseModel):
+    items: List[ExpenseResponse]
+    next_cursor: Optional[int] = None
+
 class DashboardStats(BaseModel):
     monthly_revenue: float
     daily_revenue: float
@@ -127,6 +147,28 @@ class TaskResponse(TaskBase):
     class Config:
         from_attributes = True
 
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[int] = None
+
+class TaskBoardItem(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+    due_time: Optional[datetime] = None
+    is_completed: Optional[bool] = False
+    assigned_staff_id: Optional[int] = None
+    assigned_staff_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class TodayBoard(BaseModel):
+    date: date
+    overdue: List[TaskBoardItem]
+    today: List[TaskBoardItem]
+    unscheduled: List[TaskBoardItem]
+
 class MilestoneBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -155,7 +197,12 @@ class MilestoneResponse(MilestoneBase):
     class Config:
         from_attributes = True
 
+class MilestonePage(BaseModel):
+    items: List[MilestoneResponse]
+    next_cursor: Optional[int] = None
+
 class BudgetStatus(BaseModel):
+    id: int
     category: str
     allocated: float
     spent: float
@@ -166,4 +213,57 @@ class DetailedFinanceReport(BaseModel):
     monthly_expenses: float
     estimated_profit: float
     budgets: List[BudgetStatus]
-    expense_logs: List[ExpenseResponse]
+
+class ProfitLossPeriod(BaseModel):
+    period: str
+    income: float
+    expenses: float
+    salaries: float
+    net_profit: float
+    expenses_by_category: Dict[str, float]
+
+class ProfitLossReport(BaseModel):
+    start_date: date
+    end_date: date
+    period: str
+    total_income: float
+    total_expenses: float
+    total_salaries: float
+    net_profit: float
+    expenses_by_category: Dict[str, float]
+    periods: List[ProfitLossPeriod]
+
+class MenuItemSales(BaseModel):
+    menu_item_id: int
+    name: str
+    category: Optional[str] = None
+    quantity: int
+    revenue: float
+    order_count: int
+
+    class Config:
+        from_attributes = True
+
+class CategorySales(BaseModel):
+    category: Optional[str] = None
+    quantity: int
+    revenue: float
+
+    class Config:
+        from_attributes = True
+
+class StaffPerformanceDay(BaseModel):
+    day: date
+    orders_handled: int
+    prep_median_seconds: Optional[float] = None
+    prep_p90_seconds: Optional[float] = None
+    delivery_median_seconds: Optional[float] = None
+    delivery_p90_seconds: Optional[float] = None
+    load_per_hour: List[int]
+
+class StaffPerformance(BaseModel):
+    staff_id: int
+    name: Optional[str] = None
+    orders_handled: int
+    load_per_hour: List[int]
+    days: List[StaffPerformanceDay]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
 from datetime import datetime
+from app.models.models import UserRole
 
 # User Schemas
 class UserBase(BaseModel):
@@ -15,6 +16,11 @@ class UserUpdate(UserBase):
     role: Optional[str] = None
     coupon_eligible: Optional[bool] = None
 
+class UserAdminUpdate(BaseModel):
+    full_name: Optional[str] = None
+    role: Optional[UserRole] = None
+    coupon_eligible: Optional[bool] = None
+
 class UserResponse(UserBase):
     id: int
     role: str
@@ -27,6 +33,14 @@ class UserResponse(UserBase):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
 
 class TokenData(BaseModel):
     email: Optional[str] = None
@@ -0,0 +1,119 @@
+"""Run the API under uvicorn with several worker processes.
+
+    python -m app.serve [--workers 4] [--host 0.0.0.0] [--port 8000] [--migrate]
+
+Before any worker starts, the parent checks that the database is at the Alembic head
+(upgrading it with --migrate) and creates the upload directory, so workers never race on
+either. uvloop and httptools are used when installed. On SIGTERM or SIGINT each worker stops
+accepting connections and finishes in-flight requests for up to SERVER_GRACEFUL_TIMEOUT_SECONDS
+before exiting. Run from the repository root. Each worker keeps its own caches, rate-limit
+buckets and /metrics counters.
+"""
+import argparse
+import importlib.util
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1)))
+SERVER_BACKLOG = int(os.getenv("SERVER_BACKLOG", "2048"))
+SERVER_KEEPALIVE_SECONDS = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "5"))
+SERVER_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv("SERVER_GRACEFUL_TIMEOUT_SECONDS", "30"))
+SERVER_LIMIT_CONCURRENCY = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "0"))   # 0: unlimited
+SERVER_MAX_REQUESTS = int(os.getenv("SERVER_MAX_REQUESTS", "0"))             # 0: never recycle workers
+SERVER_MAX_REQUESTS_JITTER = int(os.getenv("SERVER_MAX_REQUESTS_JITTER", "0"))
+SERVER_PROXY_HEADERS = os.getenv("SERVER_PROXY_HEADERS", "false").lower() == "true"
+SERVER_FORWARDED_ALLOW_IPS = os.getenv("SERVER_FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+logger = logging.getLogger("app.serve")
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+def check_schema(migrate: bool = False):
+    from alembic import command
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    from app.database.database import SQLALCHEMY_DATABASE_URL, engine
+
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", SQLALCHEMY_DATABASE_URL)
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    try:
+        with engine.connect() as connection:
+            current = set(MigrationContext.configure(connection).get_current_heads())
+        if current == heads:
+            return current
+        if not migrate:
+            raise SchemaOutOfDate(
+                f"database is at {sorted(current) or 'no revision'}, code expects {sorted(heads)}; "
+                "run `alembic upgrade head` or start with --migrate"
+            )
+        command.upgrade(config, "head")
+        return heads
+    finally:
+        # Workers open their own connections; nothing inherited from the check stays open
+        engine.dispose()
+
+def prepare_directories():
+    from app.services.review_service import UPLOAD_DIR
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+def event_loop():
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+def http_protocol():
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY)
+    parser.add_argument("--migrate", action="store_true", help="upgrade the database to the Alembic head first")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(levelname)s:     %(message)s")
+    logger.setLevel(args.log_level.upper())
+    try:
+        revision = check_schema(args.migrate)
+    except SchemaOutOfDate as exc:
+        logger.error("Schema check failed: %s", exc)
+        sys.exit(1)
+    prepare_directories()
+
+    import uvicorn
+
+    loop, http = event_loop(), http_protocol()
+    logger.info(
+        "Schema at %s; starting %d worker(s) on %s:%d with loop=%s http=%s",
+        ",".join(sorted(revision)), args.workers, args.host, args.port, loop, http
+    )
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=loop,
+        http=http,
+        backlog=SERVER_BACKLOG,
+        timeout_keep_alive=SERVER_KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        limit_concurrency=SERVER_LIMIT_CONCURRENCY or None,
+        limit_max_requests=SERVER_MAX_REQUESTS or None,
+        limit_max_requests_jitter=SERVER_MAX_REQUESTS_JITTER,
+        proxy_headers=SERVER_PROXY_HEADERS,
+        forwarded_allow_ips=SERVER_FORWARDED_ALLOW_IPS,
+        log_level=args.log_level,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,45 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from app.models.models import Order, Staff, Attendance, Expense, OrderStatus, Budget, Task, Milestone
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, extract, case, and_, or_, insert, select, union_all
+from sqlalchemy.exc import DataError, IntegrityError
+from pydantic import ValidationError
+from app.database.database import dialect_insert
+from app.models.models import Order, ArchivedOrder, Staff, Attendance, Expense, OrderStatus, Budget, Task, Milestone
 from app.schemas.admin_schemas import (
-    StaffCreate, StaffUpdate, ExpenseCreate, ExpenseUpdate,
+    StaffCreate, StaffUpdate, ExpenseCreate, ExpenseUpdate, ExpenseImportRow,
     BudgetCreate, BudgetUpdate, TaskCreate, TaskUpdate,
     MilestoneCreate, MilestoneUpdate
 )
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
+from typing import IO, Optional
+import csv
+import io
 
-def get_dashboard_stats(db: Session):
+def _dashboard_stats_query():
     today = datetime.now().date()
-    this_month = today.month
-    this_year = today.year
-
-    monthly_revenue = db.query(func.sum(Order.total)).filter(
-        extract('month', Order.created_at) == this_month,
-        extract('year', Order.created_at) == this_year,
-        Order.status != OrderStatus.CANCELLED
-    ).scalar() or 0.0
-
-    daily_revenue = db.query(func.sum(Order.total)).filter(
-        func.date(Order.created_at) == today,
-        Order.status != OrderStatus.CANCELLED
-    ).scalar() or 0.0
-
-    orders_count = db.query(func.count(Order.id)).filter(
-        func.date(Order.created_at) == today
-    ).scalar() or 0
-
-    pending_orders = db.query(func.count(Order.id)).filter(
-        Order.status == OrderStatus.PENDING
-    ).scalar() or 0
-
-    completed_orders = db.query(func.count(Order.id)).filter(
-        Order.status == OrderStatus.COMPLETED
-    ).scalar() or 0
-
-    delivery_orders = db.query(func.count(Order.id)).filter(
-        Order.order_type == "delivery",
-        func.date(Order.created_at) == today
-    ).scalar() or 0
-
-    return {
-        "monthly_revenue": monthly_revenue,
-        "daily_revenue": daily_revenue,
-        "orders_count": orders_count,
-        "pending_orders": pending_orders,
-        "completed_orders": completed_orders,
-        "delivery_orders": delivery_orders
-    }
+    is_today = func.date(Order.created_at) == today
+    this_month = and_(
+        extract('month', Order.created_at) == today.month,
+        extract('year', Order.created_at) == today.year
+    )
+    not_cancelled = Order.status != OrderStatus.CANCELLED
+    # Only the all-time completed count reaches back past ORDER_ARCHIVE_MIN_DAYS into the archive
+    archived_completed = select(func.count(ArchivedOrder.id)).where(
+        ArchivedOrder.status == OrderStatus.COMPLETED
+    ).scalar_subquery()
+
+    # One pass over orders with conditional aggregates instead of a query per stat
+    return select(
+        func.coalesce(func.sum(case((and_(this_month, not_cancelled), Order.total))), 0.0).label("monthly_revenue"),
+        func.coalesce(func.sum(case((and_(is_today, not_cancelled), Order.total))), 0.0).label("daily_revenue"),
+        func.count(case((is_today, Order.id))).label("orders_count"),
+        func.count(case((Order.status == OrderStatus.PENDING, Order.id))).label("pending_orders"),
+        (func.count(case((Order.status == OrderStatus.COMPLETED, Order.id))) + archived_completed).label("completed_orders"),
+        func.count(case((and_(Order.order_type == "delivery", is_today), Order.id))).label("delivery_orders")
+    )
+
+async def get_dashboard_stats_async(db: AsyncSession):
+    return dict((await db.execute(_dashboard_stats_query())).one()._mapping)
 
 def get_revenue_graph_data(db: Session):
     today = datetime.now().date()
@@ -73,18 +64,25 @@ def create_staff(db: Session, staff_data: StaffCreate):
     db.refresh(db_staff)
     return db_staff
 
-def get_all_staff(db: Session):
+def get_all_staff(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
     staff_list = db.query(Staff).all()
-    # Add calculated fields for days worked/off
+
+    # Tally days worked/off for the whole roster in one grouped query
+    query = db.query(
+        Attendance.staff_id,
+        func.sum(case((Attendance.status == "present", 1), else_=0)).label("days_worked"),
+        func.sum(case((Attendance.status == "off", 1), else_=0)).label("days_off")
+    )
+    if start_date:
+        query = query.filter(Attendance.date >= start_date)
+    if end_date:
+        query = query.filter(Attendance.date < end_date + timedelta(days=1))
+    counts = {r.staff_id: r for r in query.group_by(Attendance.staff_id).all()}
+
     for s in staff_list:
-        s.days_worked = db.query(func.count(Attendance.id)).filter(
-            Attendance.staff_id == s.id,
-            Attendance.status == "present"
-        ).scalar() or 0
-        s.days_off = db.query(func.count(Attendance.id)).filter(
-            Attendance.staff_id == s.id,
-            Attendance.status == "off"
-        ).scalar() or 0
+        row = counts.get(s.id)
+        s.days_worked = (row.days_worked or 0) if row else 0
+        s.days_off = (row.days_off or 0) if row else 0
     return staff_list
 
 def update_staff(db: Session, staff_id: int, staff_data: StaffUpdate):
@@ -103,29 +101,48 @@ def update_staff(db: Session, staff_id: int, staff_data: StaffUpdate):
 def delete_staff(db: Session, staff_id: int):
     db_staff = db.query(Staff).filter(Staff.id == staff_id).first()
     if db_staff:
+        # Foreign keys are enforced, so detach planning items and archived orders that have no back-reference
+        db.query(Task).filter(Task.assigned_staff_id == staff_id).update({"assigned_staff_id": None}, synchronize_session=False)
+        db.query(Milestone).filter(Milestone.assigned_staff_id == staff_id).update({"assigned_staff_id": None}, synchronize_session=False)
+        db.query(ArchivedOrder).filter(ArchivedOrder.assigned_staff_id == staff_id).update({"assigned_staff_id": None}, synchronize_session=False)
         db.delete(db_staff)
         db.commit()
         return True
     return False
 
 # Attendance
+def _upsert_attendance(db: Session, rows: list):
+    stmt = dialect_insert(db)(Attendance).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Attendance.staff_id, Attendance.day],
+        set_={"status": stmt.excluded.status}
+    )
+    db.execute(stmt)
+
 def record_attendance(db: Session, staff_id: int, status: str):
-    today = datetime.now().date()
-    # Check if already recorded for today
-    existing = db.query(Attendance).filter(
+    now = datetime.now()
+    _upsert_attendance(db, [{"staff_id": staff_id, "status": status, "date": now, "day": now.date()}])
+    db.commit()
+    return db.query(Attendance).filter(
         Attendance.staff_id == staff_id,
-        func.date(Attendance.date) == today
+        Attendance.day == now.date()
     ).first()
 
-    if existing:
-        existing.status = status
-    else:
-        existing = Attendance(staff_id=staff_id, status=status)
-        db.add(existing)
+def record_bulk_attendance(db: Session, entries: list, day: Optional[date] = None):
+    now = datetime.now()
+    day = day or now.date()
+    recorded_at = now if day == now.date() else datetime.combine(day, datetime.min.time())
+
+    # One row per staff member; the last entry wins, as a repeated upsert would
+    statuses = {entry.staff_id: entry.status for entry in entries}
+    if statuses:
+        _upsert_attendance(db, [
+            {"staff_id": staff_id, "status": status, "date": recorded_at, "day": day}
+            for staff_id, status in statuses.items()
+        ])
+        db.commit()
 
-    db.commit()
-    db.refresh(existing)
-    return existing
+    return db.query(Attendance).filter(Attendance.day == day).order_by(Attendance.staff_id).all()
 
 # Finances
 def create_expense(db: Session, expense_data: ExpenseCreate):
@@ -135,8 +152,85 @@ def create_expense(db: Session, expense_data: ExpenseCreate):
     db.refresh(db_expense)
     return db_expense
 
-def get_expenses(db: Session):
-    return db.query(Expense).order_by(Expense.date.desc()).all()
+def _paginate(query, limit: int):
+    items = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = items[-1].id
+    return {"items": items, "next_cursor": next_cursor}
+
+IMPORT_BATCH_SIZE = 500
+
+def import_expenses(db: Session, stream: IO[bytes]):
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    imported = 0
+    rejected = []
+    batch = []
+    try:
+        fieldnames = [name.strip() for name in reader.fieldnames or []]
+        missing = {"category", "amount"} - set(fieldnames)
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+        reader.fieldnames = fieldnames
+
+        for row in reader:
+            values = {k: v.strip() for k, v in row.items() if k and v and v.strip()}
+            try:
+                expense = ExpenseImportRow(**values)
+            except ValidationError as e:
+                reason = "; ".join(f"{'.'.join(str(l) for l in err['loc'])}: {err['msg']}" for err in e.errors())
+                rejected.append({"row": reader.line_num, "reason": reason})
+                continue
+
+            data = expense.model_dump()
+            data["date"] = data["date"] or datetime.now()
+            batch.append(data)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                db.execute(insert(Expense), batch)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            db.execute(insert(Expense), batch)
+            imported += len(batch)
+        db.commit()
+    except csv.Error as e:
+        db.rollback()
+        raise ValueError(str(e)) from e
+    except (IntegrityError, DataError) as e:
+        db.rollback()
+        raise ValueError(f"rows rejected by the database, nothing imported: {e.orig}") from e
+    except Exception:
+        db.rollback()
+        raise
+
+    return {"imported": imported, "rejected": rejected}
+
+def get_expenses(
+    db: Session,
+    cursor: Optional[int] = None,
+    limit: int = 50,
+    category: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    query = db.query(Expense)
+    if category:
+        query = query.filter(Expense.category == category)
+    if start_date:
+        query = query.filter(Expense.date >= start_date)
+    if end_date:
+        query = query.filter(Expense.date < end_date + timedelta(days=1))
+    if cursor:
+        # Keyset on (date, id), comparing against the stored date of the cursor row
+        cursor_date = db.query(Expense.date).filter(Expense.id == cursor).scalar_subquery()
+        query = query.filter(or_(
+            Expense.date < cursor_date,
+            and_(Expense.date == cursor_date, Expense.id < cursor)
+        ))
+
+    return _paginate(query.order_by(Expense.date.desc(), Expense.id.desc()), limit)
 
 def update_expense(db: Session, expense_id: int, expense_data: ExpenseUpdate):
     db_expense = db.query(Expense).filter(Expense.id == expense_id).first()
@@ -155,31 +249,132 @@ def delete_expense(db: Session, expense_id: int):
         return True
     return False
 
-def get_finance_summary(db: Session):
-    today = datetime.now().date()
-    this_month = today.month
-    this_year = today.year
-
-    total_income = db.query(func.sum(Order.total)).filter(
-        extract('month', Order.created_at) == this_month,
-        extract('year', Order.created_at) == this_year,
+def _finance_totals(month_start: datetime, month_end: datetime):
+    # This month's completed-order income, expenses and active salaries as scalar subqueries
+    income = select(func.coalesce(func.sum(Order.total), 0.0)).where(
+        Order.created_at >= month_start,
+        Order.created_at < month_end,
         Order.status == OrderStatus.COMPLETED
-    ).scalar() or 0.0
-
-    total_expenses = db.query(func.sum(Expense.amount)).filter(
-        extract('month', Expense.date) == this_month,
-        extract('year', Expense.date) == this_year
-    ).scalar() or 0.0
-
-    # Also include salaries in expenses
-    staff_salaries = db.query(func.sum(Staff.salary)).filter(Staff.employment_status == "active").scalar() or 0.0
+    ).scalar_subquery()
+    expenses = select(func.coalesce(func.sum(Expense.amount), 0.0)).where(
+        Expense.date >= month_start,
+        Expense.date < month_end
+    ).scalar_subquery()
+    salaries = select(func.coalesce(func.sum(Staff.salary), 0.0)).where(
+        Staff.employment_status == "active"
+    ).scalar_subquery()
+    return income.label("income"), expenses.label("expenses"), salaries.label("salaries")
+
+def _finance_summary(income: float, expenses: float, salaries: float):
+    # Salaries count as expenses
+    total_expenses = expenses + salaries
+    return {
+        "total_income": income,
+        "total_expenses": total_expenses,
+        "estimated_profit": income - total_expenses
+    }
 
-    total_expenses += staff_salaries
+def get_finance_summary(db: Session):
+    today = datetime.now().date()
+    row = db.execute(select(*_finance_totals(*_month_bounds(today.year, today.month)))).one()
+    return _finance_summary(row.income, row.expenses, row.salaries)
+
+# Profit & Loss
+PAID_ATTENDANCE_STATUSES = ("present",)
+
+def _period_key(day: date, period: str):
+    if period == "day":
+        return day.isoformat()
+    if period == "week":
+        iso_year, iso_week, _ = day.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if period == "year":
+        return str(day.year)
+    return f"{day.year}-{day.month:02d}"
+
+def _days_in_month(day: date):
+    start, end = _month_bounds(day.year, day.month)
+    return (end - start).days
+
+def get_profit_and_loss(db: Session, start_date: date, end_date: date, period: str = "month"):
+    range_start = start_date
+    range_end = end_date + timedelta(days=1)
+
+    # Archived orders still count as income for their period
+    orders = union_all(
+        *[select(o.created_at, o.total, o.status) for o in (Order, ArchivedOrder)]
+    ).subquery("orders")
+    income_day = func.date(orders.c.created_at)
+    income_rows = db.query(
+        income_day.label("day"),
+        func.sum(orders.c.total).label("total")
+    ).filter(
+        orders.c.created_at >= range_start,
+        orders.c.created_at < range_end,
+        orders.c.status == OrderStatus.COMPLETED
+    ).group_by(income_day).all()
+
+    expense_day = func.date(Expense.date)
+    expense_rows = db.query(
+        expense_day.label("day"),
+        Expense.category,
+        func.sum(Expense.amount).label("total")
+    ).filter(
+        Expense.date >= range_start,
+        Expense.date < range_end
+    ).group_by(expense_day, Expense.category).all()
+
+    # Monthly salaries are prorated per paid attendance day in that month
+    attendance_day = func.date(Attendance.date)
+    salary_rows = db.query(
+        attendance_day.label("day"),
+        func.sum(Staff.salary).label("total")
+    ).join(Staff, Staff.id == Attendance.staff_id).filter(
+        Attendance.date >= range_start,
+        Attendance.date < range_end,
+        Attendance.status.in_(PAID_ATTENDANCE_STATUSES)
+    ).group_by(attendance_day).all()
+
+    buckets = {}
+    def bucket(day):
+        key = _period_key(day, period)
+        if key not in buckets:
+            buckets[key] = {"period": key, "income": 0.0, "expenses": 0.0, "salaries": 0.0, "expenses_by_category": {}}
+        return buckets[key]
+
+    for r in income_rows:
+        bucket(date.fromisoformat(str(r.day)))["income"] += r.total or 0.0
+
+    for r in expense_rows:
+        b = bucket(date.fromisoformat(str(r.day)))
+        b["expenses"] += r.total or 0.0
+        b["expenses_by_category"][r.category] = b["expenses_by_category"].get(r.category, 0.0) + (r.total or 0.0)
+
+    for r in salary_rows:
+        day = date.fromisoformat(str(r.day))
+        bucket(day)["salaries"] += (r.total or 0.0) / _days_in_month(day)
+
+    periods = [buckets[key] for key in sorted(buckets)]
+    expenses_by_category = {}
+    for b in periods:
+        b["net_profit"] = b["income"] - b["expenses"] - b["salaries"]
+        for category, amount in b["expenses_by_category"].items():
+            expenses_by_category[category] = expenses_by_category.get(category, 0.0) + amount
+
+    total_income = sum(b["income"] for b in periods)
+    total_expenses = sum(b["expenses"] for b in periods)
+    total_salaries = sum(b["salaries"] for b in periods)
 
     return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "period": period,
         "total_income": total_income,
         "total_expenses": total_expenses,
-        "estimated_profit": total_income - total_expenses
+        "total_salaries": total_salaries,
+        "net_profit": total_income - total_expenses - total_salaries,
+        "expenses_by_category": expenses_by_category,
+        "periods": periods
     }
 
 # Budget Management
@@ -207,41 +402,88 @@ def delete_budget(db: Session, budget_id: int):
         return True
     return False
 
+def _month_bounds(year: int, month: int):
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
 def get_detailed_finance_report(db: Session):
     today = datetime.now().date()
-    month = today.month
-    year = today.year
-
-    summary = get_finance_summary(db)
-
-    # Get budgets for this month
-    budgets = db.query(Budget).filter(Budget.month == month, Budget.year == year).all()
-    budget_statuses = []
+    month_start, month_end = _month_bounds(today.year, today.month)
 
-    for b in budgets:
-        spent = db.query(func.sum(Expense.amount)).filter(
-            Expense.category == b.category,
-            extract('month', Expense.date) == month,
-            extract('year', Expense.date) == year
-        ).scalar() or 0.0
-
-        budget_statuses.append({
-            "category": b.category,
-            "allocated": b.allocated_amount,
-            "spent": spent,
-            "remaining": b.allocated_amount - spent
-        })
-
-    expenses = get_expenses(db)
+    # Totals and budget usage in one round trip: the totals row is outer-joined to this month's
+    # budgets, each grouped with its expenses, so it comes back even when no budget is set
+    totals = select(*_finance_totals(month_start, month_end)).subquery("totals")
+    results = db.query(
+        totals.c.income,
+        totals.c.expenses,
+        totals.c.salaries,
+        Budget.id,
+        Budget.category,
+        Budget.allocated_amount,
+        func.coalesce(func.sum(Expense.amount), 0.0).label("spent")
+    ).select_from(totals).outerjoin(Budget, and_(
+        Budget.month == today.month,
+        Budget.year == today.year
+    )).outerjoin(Expense, and_(
+        Expense.category == Budget.category,
+        Expense.date >= month_start,
+        Expense.date < month_end
+    )).group_by(
+        totals.c.income, totals.c.expenses, totals.c.salaries,
+        Budget.id, Budget.category, Budget.allocated_amount
+    ).order_by(Budget.id).all()
+
+    summary = _finance_summary(results[0].income, results[0].expenses, results[0].salaries)
+    budget_statuses = [{
+        "id": r.id,
+        "category": r.category,
+        "allocated": r.allocated_amount,
+        "spent": r.spent,
+        "remaining": r.allocated_amount - r.spent
+    } for r in results if r.id is not None]
 
     return {
         "monthly_revenue": summary["total_income"],
         "monthly_expenses": summary["total_expenses"],
         "estimated_profit": summary["estimated_profit"],
-        "budgets": budget_statuses,
-        "expense_logs": expenses
+        "budgets": budget_statuses
     }
 
+# Planning boards
+def _filter_planning(query, model, due_column, is_completed=None, assigned_staff_id=None,
+                     due_after=None, due_before=None, overdue=None):
+    if is_completed is not None:
+        query = query.filter(model.is_completed == is_completed)
+    if assigned_staff_id is not None:
+        query = query.filter(model.assigned_staff_id == assigned_staff_id)
+    if due_after:
+        query = query.filter(due_column >= due_after)
+    if due_before:
+        query = query.filter(due_column < due_before)
+    if overdue is not None:
+        now = datetime.now()
+        if overdue:
+            query = query.filter(model.is_completed == False, due_column < now)
+        else:
+            # Spelled out rather than negated: NOT (... < now) is NULL for undated items
+            query = query.filter(or_(model.is_completed == True, due_column.is_(None), due_column >= now))
+    return query
+
+def _order_by_due(query, db: Session, model, due_column, cursor: Optional[int] = None):
+    # Earliest due first with undated items last; keyset on (due, id) against the stored due of the cursor row
+    if cursor:
+        cursor_due = db.query(due_column).filter(model.id == cursor).scalar_subquery()
+        query = query.filter(or_(
+            and_(cursor_due.is_(None), due_column.is_(None), model.id > cursor),
+            and_(cursor_due.isnot(None), or_(
+                due_column.is_(None),
+                due_column > cursor_due,
+                and_(due_column == cursor_due, model.id > cursor)
+            ))
+        ))
+    return query.order_by(due_column.is_(None), due_column.asc(), model.id.asc())
+
 # Task Management
 def create_task(db: Session, task_data: TaskCreate):
     db_task = Task(**task_data.model_dump())
@@ -250,8 +492,41 @@ def create_task(db: Session, task_data: TaskCreate):
     db.refresh(db_task)
     return db_task
 
-def get_tasks(db: Session):
-    return db.query(Task).order_by(Task.due_time.asc()).all()
+def get_tasks(
+    db: Session,
+    is_completed: Optional[bool] = None,
+    assigned_staff_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    cursor: Optional[int] = None,
+    limit: int = 50
+):
+    query = db.query(Task).options(joinedload(Task.assigned_staff))
+    query = _filter_planning(query, Task, Task.due_time, is_completed, assigned_staff_id, due_after, due_before, overdue)
+    return _paginate(_order_by_due(query, db, Task, Task.due_time, cursor), limit)
+
+def get_today_board(db: Session):
+    today_start = datetime.combine(datetime.now().date(), datetime.min.time())
+    today_end = today_start + timedelta(days=1)
+
+    rows = db.query(
+        Task.id, Task.title, Task.description, Task.due_time, Task.is_completed,
+        Task.assigned_staff_id, Staff.name.label("assigned_staff_name")
+    ).outerjoin(Staff, Staff.id == Task.assigned_staff_id).filter(or_(
+        and_(Task.is_completed == False, or_(Task.due_time < today_end, Task.due_time.is_(None))),
+        and_(Task.due_time >= today_start, Task.due_time < today_end)
+    )).order_by(Task.due_time.is_(None), Task.due_time.asc(), Task.id.asc()).all()
+
+    board = {"date": today_start.date(), "overdue": [], "today": [], "unscheduled": []}
+    for r in rows:
+        if r.due_time is None:
+            board["unscheduled"].append(r)
+        elif r.due_time < today_start:
+            board["overdue"].append(r)
+        else:
+            board["today"].append(r)
+    return board
 
 def update_task(db: Session, task_id: int, task_data: TaskUpdate):
     db_task = db.query(Task).filter(Task.id == task_id).first()
@@ -278,11 +553,22 @@ def create_milestone(db: Session, milestone_data: MilestoneCreate):
     db.refresh(db_milestone)
     return db_milestone
 
-def get_milestones(db: Session, milestone_type: str = None):
-    query = db.query(Milestone)
+def get_milestones(
+    db: Session,
+    milestone_type: str = None,
+    is_completed: Optional[bool] = None,
+    assigned_staff_id: Optional[int] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    overdue: Optional[bool] = None,
+    cursor: Optional[int] = None,
+    limit: int = 50
+):
+    query = db.query(Milestone).options(joinedload(Milestone.assigned_staff))
     if milestone_type:
         query = query.filter(Milestone.milestone_type == milestone_type)
-    return query.order_by(Milestone.deadline.asc()).all()
+    query = _filter_planning(query, Milestone, Milestone.deadline, is_completed, assigned_staff_id, due_after, due_before, overdue)
+    return _paginate(_order_by_due(query, db, Milestone, Milestone.deadline, cursor), limit)
 
 def update_milestone(db: Session, milestone_id: int, milestone_data: MilestoneUpdate):
     db_milestone = db.query(Milestone).filter(Milestone.id == milestone_id).first()
@@ -0,0 +1,289 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, insert, update, delete, case, extract, union_all, bindparam
+from app.database.database import dialect_insert
+from app.models.models import (
+    Order, OrderItem, ArchivedOrder, ArchivedOrderItem, MenuItem, MenuItemDailySales, OrderStatus,
+    Staff, StaffPerformanceCache
+)
+from datetime import date, datetime, timedelta
+from typing import Optional
+import json
+import logging
+import os
+
+# Days are cached once they are this many days old (UTC); younger days are always computed live
+STAFF_PERFORMANCE_CACHE_AFTER_DAYS = int(os.getenv("STAFF_PERFORMANCE_CACHE_AFTER_DAYS", "2"))
+STAFF_PERFORMANCE_MAX_DAYS = int(os.getenv("STAFF_PERFORMANCE_MAX_DAYS", "92"))
+
+logger = logging.getLogger("app.analytics")
+
+def _minus_clamped(column, amount):
+    return case((column > amount, column - amount), else_=0)
+
+def record_order_sales(db: Session, order: Order, items: list, sign: int = 1):
+    # Fold the order's lines into per-item daily counters; sign=-1 reverses a cancelled order
+    day = order.created_at.date()
+    totals = {}
+    for item in items:
+        quantity, revenue = totals.get(item.menu_item_id, (0, 0.0))
+        totals[item.menu_item_id] = (quantity + item.quantity, revenue + item.quantity * item.price_at_time)
+    if not totals:
+        return
+
+    if sign < 0:
+        # Orders placed before the counters were backfilled were never counted; clamp at zero
+        # instead of writing negative rows (run the backfill for exact figures)
+        counters = MenuItemDailySales.__table__
+        counted = dict(db.execute(
+            select(counters.c.menu_item_id, counters.c.quantity).where(
+                counters.c.menu_item_id.in_(totals), counters.c.day == day
+            )
+        ).all())
+        short = sorted(
+            menu_item_id for menu_item_id, (quantity, _) in totals.items()
+            if counted.get(menu_item_id, 0) < quantity
+        )
+        if short:
+            logger.warning(
+                "Cancelled order %s was not fully counted for %s (menu items %s); clamped at zero, "
+                "run POST /admin/analytics/menu/backfill for exact figures", order.id, day, short
+            )
+        db.execute(
+            update(counters).where(
+                counters.c.menu_item_id == bindparam("item_id"), counters.c.day == bindparam("sales_day")
+            ).values({
+                counters.c.quantity: _minus_clamped(counters.c.quantity, bindparam("sold")),
+                counters.c.revenue: _minus_clamped(counters.c.revenue, bindparam("earned")),
+                counters.c.order_count: _minus_clamped(counters.c.order_count, 1)
+            }),
+            [
+                {"item_id": menu_item_id, "sales_day": day, "sold": quantity, "earned": revenue}
+                for menu_item_id, (quantity, revenue) in totals.items()
+            ]
+        )
+        return
+
+    stmt = dialect_insert(db)(MenuItemDailySales).values([
+        {
+            "menu_item_id": menu_item_id,
+            "day": day,
+            "quantity": quantity,
+            "revenue": revenue,
+            "order_count": 1
+        }
+        for menu_item_id, (quantity, revenue) in totals.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MenuItemDailySales.menu_item_id, MenuItemDailySales.day],
+        set_={
+            "quantity": MenuItemDailySales.quantity + stmt.excluded.quantity,
+            "revenue": MenuItemDailySales.revenue + stmt.excluded.revenue,
+            "order_count": MenuItemDailySales.order_count + stmt.excluded.order_count
+        }
+    )
+    db.execute(stmt)
+
+def _sales_lines(item, order):
+    return select(
+        item.menu_item_id,
+        item.order_id,
+        item.quantity,
+        item.price_at_time,
+        func.date(order.created_at).label("day")
+    ).join(order, order.id == item.order_id).where(
+        order.status != OrderStatus.CANCELLED,
+        item.menu_item_id.isnot(None)
+    )
+
+def backfill_menu_item_sales(db: Session):
+    # Rebuild every counter from live and archived order lines in a single INSERT .. SELECT
+    lines = union_all(
+        _sales_lines(OrderItem, Order), _sales_lines(ArchivedOrderItem, ArchivedOrder)
+    ).subquery("lines")
+    source = select(
+        lines.c.menu_item_id,
+        lines.c.day,
+        func.sum(lines.c.quantity),
+        func.sum(lines.c.quantity * lines.c.price_at_time),
+        func.count(func.distinct(lines.c.order_id))
+    ).group_by(lines.c.menu_item_id, lines.c.day)
+
+    db.execute(delete(MenuItemDailySales))
+    result = db.execute(insert(MenuItemDailySales).from_select(
+        ["menu_item_id", "day", "quantity", "revenue", "order_count"], source
+    ))
+    db.commit()
+    return {"rows": result.rowcount}
+
+def _sales_in_range(query, start_date: Optional[date], end_date: Optional[date]):
+    if start_date:
+        query = query.filter(MenuItemDailySales.day >= start_date)
+    if end_date:
+        query = query.filter(MenuItemDailySales.day <= end_date)
+    return query
+
+def get_item_sales(
+    db: Session,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    order_by: str = "quantity",
+    limit: Optional[int] = None
+):
+    quantity = func.sum(MenuItemDailySales.quantity).label("quantity")
+    revenue = func.sum(MenuItemDailySales.revenue).label("revenue")
+    query = db.query(
+        MenuItem.id.label("menu_item_id"),
+        MenuItem.name,
+        MenuItem.category,
+        quantity,
+        revenue,
+        func.sum(MenuItemDailySales.order_count).label("order_count")
+    ).join(MenuItem, MenuItem.id == MenuItemDailySales.menu_item_id)
+    query = _sales_in_range(query, start_date, end_date).group_by(
+        MenuItem.id, MenuItem.name, MenuItem.category
+    ).having(func.sum(MenuItemDailySales.order_count) > 0)
+    query = query.order_by((revenue if order_by == "revenue" else quantity).desc(), MenuItem.id)
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+def get_category_sales(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    revenue = func.sum(MenuItemDailySales.revenue).label("revenue")
+    query = db.query(
+        MenuItem.category,
+        func.sum(MenuItemDailySales.quantity).label("quantity"),
+        revenue
+    ).join(MenuItem, MenuItem.id == MenuItemDailySales.menu_item_id)
+    query = _sales_in_range(query, start_date, end_date).group_by(MenuItem.category).having(
+        func.sum(MenuItemDailySales.order_count) > 0
+    )
+    return query.order_by(revenue.desc()).all()
+
+# Staff performance
+def _seconds_between(db: Session, end, start):
+    if db.bind.dialect.name == "sqlite":
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return extract("epoch", end - start)
+
+def _round_seconds(value):
+    return round(value, 3) if value is not None else None
+
+def _staff_orders(start: datetime, end: datetime):
+    # Archived orders count too, so a day recomputed after archival is still complete
+    def orders(model):
+        return select(
+            model.assigned_staff_id, model.created_at, model.accepted_at, model.prepared_at, model.delivered_at
+        ).where(
+            model.assigned_staff_id.isnot(None),
+            model.status != OrderStatus.CANCELLED,
+            model.created_at >= start,
+            model.created_at < end
+        )
+    return union_all(orders(Order), orders(ArchivedOrder)).subquery("staff_orders")
+
+def _compute_staff_days(db: Session, first_day: date, last_day: date):
+    start = datetime.combine(first_day, datetime.min.time())
+    orders = _staff_orders(start, start + timedelta(days=(last_day - first_day).days + 1))
+    prep = _seconds_between(db, orders.c.prepared_at, orders.c.accepted_at)
+    delivery = _seconds_between(db, orders.c.delivered_at, orders.c.prepared_at)
+    order_day = func.date(orders.c.created_at)
+    partition = (orders.c.assigned_staff_id, order_day)
+
+    # Rank each order's prep and delivery time within its staff member's day
+    ranked = select(
+        orders.c.assigned_staff_id.label("staff_id"),
+        order_day.label("day"),
+        extract("hour", orders.c.created_at).label("hour"),
+        prep.label("prep"),
+        delivery.label("delivery"),
+        func.row_number().over(partition_by=partition, order_by=(prep.is_(None), prep)).label("prep_rank"),
+        func.count(prep).over(partition_by=partition).label("prep_n"),
+        func.row_number().over(
+            partition_by=partition, order_by=(delivery.is_(None), delivery)
+        ).label("delivery_rank"),
+        func.count(delivery).over(partition_by=partition).label("delivery_n")
+    ).subquery()
+
+    def nearest_rank(value, rank, n, p):
+        return func.min(case((value.isnot(None) & (rank >= n * p), value)))
+
+    rows = db.execute(select(
+        ranked.c.staff_id,
+        ranked.c.day,
+        func.count().label("orders_handled"),
+        nearest_rank(ranked.c.prep, ranked.c.prep_rank, ranked.c.prep_n, 0.5).label("prep_median"),
+        nearest_rank(ranked.c.prep, ranked.c.prep_rank, ranked.c.prep_n, 0.9).label("prep_p90"),
+        nearest_rank(ranked.c.delivery, ranked.c.delivery_rank, ranked.c.delivery_n, 0.5).label("delivery_median"),
+        nearest_rank(ranked.c.delivery, ranked.c.delivery_rank, ranked.c.delivery_n, 0.9).label("delivery_p90"),
+        *[func.sum(case((ranked.c.hour == hour, 1), else_=0)).label(f"h{hour}") for hour in range(24)]
+    ).group_by(ranked.c.staff_id, ranked.c.day).order_by(ranked.c.day, ranked.c.staff_id)).all()
+
+    days = {}
+    for r in rows:
+        # SQLite returns date() as text
+        day = r.day if isinstance(r.day, date) else date.fromisoformat(r.day)
+        days.setdefault(day, []).append({
+            "staff_id": r.staff_id,
+            "day": day.isoformat(),
+            "orders_handled": r.orders_handled,
+            "prep_median_seconds": _round_seconds(r.prep_median),
+            "prep_p90_seconds": _round_seconds(r.prep_p90),
+            "delivery_median_seconds": _round_seconds(r.delivery_median),
+            "delivery_p90_seconds": _round_seconds(r.delivery_p90),
+            "load_per_hour": [getattr(r, f"h{hour}") or 0 for hour in range(24)]
+        })
+    return days
+
+def _staff_cache_cutoff():
+    # created_at is stored in UTC; days before this have had time for late status changes
+    return datetime.utcnow().date() - timedelta(days=STAFF_PERFORMANCE_CACHE_AFTER_DAYS)
+
+def invalidate_staff_performance(db: Session, order: Order):
+    # A late change to an order on a cached day drops that day so the next read recomputes it
+    if order.created_at and order.created_at.date() < _staff_cache_cutoff():
+        db.execute(delete(StaffPerformanceCache).where(StaffPerformanceCache.day == order.created_at.date()))
+
+def get_staff_performance(db: Session, start_date: date, end_date: date):
+    cutoff = _staff_cache_cutoff()
+    cached = {
+        c.day: json.loads(c.payload)
+        for c in db.query(StaffPerformanceCache).filter(
+            StaffPerformanceCache.day >= start_date,
+            StaffPerformanceCache.day <= end_date
+        ).all()
+    }
+
+    # Uncached days come from one query over their span; only days before the cutoff are cached
+    last_day = min(end_date, datetime.utcnow().date())
+    days = [start_date + timedelta(days=n) for n in range((last_day - start_date).days + 1)]
+    missing = [day for day in days if day not in cached]
+    computed = _compute_staff_days(db, missing[0], missing[-1]) if missing else {}
+    closed = [{"day": day, "payload": json.dumps(computed.get(day, []))} for day in missing if day < cutoff]
+    if closed:
+        stmt = dialect_insert(db)(StaffPerformanceCache).values(closed)
+        # Another request may have cached the same day meanwhile; both computed the same stats
+        db.execute(stmt.on_conflict_do_nothing(index_elements=[StaffPerformanceCache.day]))
+        db.commit()
+
+    day_stats = []
+    for day in days:
+        day_stats.extend(cached[day] if day in cached else computed.get(day, []))
+
+    names = dict(db.query(Staff.id, Staff.name).filter(
+        Staff.id.in_({s["staff_id"] for s in day_stats})
+    ).all()) if day_stats else {}
+
+    performance = {}
+    for stats in day_stats:
+        staff = performance.setdefault(stats["staff_id"], {
+            "staff_id": stats["staff_id"],
+            "name": names.get(stats["staff_id"]),
+            "orders_handled": 0,
+            "load_per_hour": [0] * 24,
+            "days": []
+        })
+        staff["orders_handled"] += stats["orders_handled"]
+        staff["load_per_hour"] = [a + b for a, b in zip(staff["load_per_hour"], stats["load_per_hour"])]
+        staff["days"].append(stats)
+
+    return sorted(performance.values(), key=lambda s: s["staff_id"])
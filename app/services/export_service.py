@@ -0,0 +1,85 @@
+from sqlalchemy import select, union_all
+from app.database.database import ReadSessionLocal
+from app.models.models import Order, OrderItem, ArchivedOrder, ArchivedOrderItem, MenuItem, Expense
+from datetime import date, datetime, timedelta
+from typing import Optional
+import csv
+import io
+import json
+
+EXPORT_CHUNK_SIZE = 1000
+
+# Order exports read the live and archived tables as one
+def _orders_query():
+    def orders(order):
+        return select(
+            order.id, order.created_at, order.user_id, order.customer_name, order.customer_phone,
+            order.order_type, order.status, order.total, order.delivery_fee, order.table_number,
+            order.accepted_at, order.prepared_at, order.delivered_at, order.assigned_staff_id
+        )
+
+    combined = union_all(orders(Order), orders(ArchivedOrder)).subquery("orders")
+    return select(combined).order_by(combined.c.id), combined.c.created_at
+
+def _order_items_query():
+    def lines(item, order):
+        return select(
+            item.id, item.order_id, order.created_at.label("order_created_at"),
+            item.menu_item_id, MenuItem.name.label("menu_item_name"),
+            item.quantity, item.price_at_time
+        ).join(order, order.id == item.order_id).outerjoin(MenuItem, MenuItem.id == item.menu_item_id)
+
+    combined = union_all(lines(OrderItem, Order), lines(ArchivedOrderItem, ArchivedOrder)).subquery("order_items")
+    return select(combined).order_by(combined.c.id), combined.c.order_created_at
+
+def _expenses_query():
+    columns = [Expense.id, Expense.date, Expense.category, Expense.amount, Expense.description]
+    return select(*columns).order_by(Expense.id), Expense.date
+
+EXPORTS = {
+    "orders": _orders_query,
+    "order-items": _order_items_query,
+    "expenses": _expenses_query,
+}
+
+def _format_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def stream_export(
+    name: str,
+    fmt: str = "csv",
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    query, date_column = EXPORTS[name]()
+    if start_date:
+        query = query.where(date_column >= start_date)
+    if end_date:
+        query = query.where(date_column < end_date + timedelta(days=1))
+
+    # The generator outlives the request dependency, so it owns its session
+    db = ReadSessionLocal()
+    try:
+        result = db.execute(query.execution_options(stream_results=True, yield_per=EXPORT_CHUNK_SIZE))
+        keys = list(result.keys())
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(keys)
+            yield buffer.getvalue()
+
+        for partition in result.partitions():
+            buffer = io.StringIO()
+            if fmt == "csv":
+                writer = csv.writer(buffer)
+                writer.writerows([_format_value(v) for v in row] for row in partition)
+            else:
+                for row in partition:
+                    buffer.write(json.dumps({k: _format_value(v) for k, v in zip(keys, row)}))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+    finally:
+        db.close()
@@ -1,20 +1,28 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.models import Order, OrderItem, MenuItem, User
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, insert, delete
+from app.models.models import Order, OrderItem, ArchivedOrder, ArchivedOrderItem, MenuItem, User, OrderStatus
+from app.services import analytics_service
 from app.schemas.schemas import OrderCreate
-from datetime import datetime
+from datetime import datetime, timedelta
+import os
 
-def create_order(db: Session, order_data: OrderCreate, user_id: int = None):
+ORDER_ARCHIVE_AFTER_DAYS = int(os.getenv("ORDER_ARCHIVE_AFTER_DAYS", "90"))
+ORDER_ARCHIVE_BATCH_SIZE = int(os.getenv("ORDER_ARCHIVE_BATCH_SIZE", "500"))
+# The dashboard's today, this-month and 30-day figures only read live orders
+ORDER_ARCHIVE_MIN_DAYS = 32
+ARCHIVABLE_STATUSES = (OrderStatus.COMPLETED, OrderStatus.CANCELLED)
+
+def _build_order(order_data: OrderCreate, prices: dict, user_id: int = None, coupon_eligible: bool = False):
     # Calculate total and delivery fee
     subtotal = 0.0
     items_to_create = []
 
     for item in order_data.items:
-        menu_item = db.query(MenuItem).filter(MenuItem.id == item.menu_item_id).first()
-        if not menu_item:
+        item_price = prices.get(item.menu_item_id)
+        if item_price is None:
             continue
 
-        item_price = menu_item.price
         subtotal += item_price * item.quantity
 
         items_to_create.append(OrderItem(
@@ -30,10 +38,8 @@ def create_order(db: Session, order_data: OrderCreate, user_id: int = None):
     total = subtotal + delivery_fee
 
     # Apply member discount if user_id exists
-    if user_id:
-        user = db.query(User).filter(User.id == user_id).first()
-        if user and user.coupon_eligible:
-            total = total * 0.9 # 10% discount
+    if user_id and coupon_eligible:
+        total = total * 0.9 # 10% discount
 
     db_order = Order(
         user_id=user_id,
@@ -46,6 +52,20 @@ def create_order(db: Session, order_data: OrderCreate, user_id: int = None):
         total=total,
         delivery_fee=delivery_fee
     )
+    return db_order, items_to_create
+
+def _menu_prices_query(order_data: OrderCreate):
+    menu_item_ids = {item.menu_item_id for item in order_data.items}
+    return select(MenuItem.id, MenuItem.price).where(MenuItem.id.in_(menu_item_ids))
+
+def create_order(db: Session, order_data: OrderCreate, user_id: int = None):
+    prices = dict(db.execute(_menu_prices_query(order_data)).all())
+    coupon_eligible = False
+    if user_id:
+        user = db.query(User).filter(User.id == user_id).first()
+        coupon_eligible = bool(user and user.coupon_eligible)
+
+    db_order, items_to_create = _build_order(order_data, prices, user_id, coupon_eligible)
 
     db.add(db_order)
     db.commit()
@@ -55,41 +75,46 @@ def create_order(db: Session, order_data: OrderCreate, user_id: int = None):
         item.order_id = db_order.id
         db.add(item)
 
+    analytics_service.record_order_sales(db, db_order, items_to_create)
     db.commit()
     db.refresh(db_order)
     return db_order
 
-def get_order(db: Session, order_id: int):
-    return db.query(Order).filter(Order.id == order_id).first()
-
 def get_user_orders(db: Session, user_id: int):
-    return db.query(Order).filter(Order.user_id == user_id).all()
-
-def get_all_orders(db: Session):
-    return db.query(Order).order_by(Order.created_at.desc()).all()
-
-def update_order_status(db: Session, order_id: int, status: str):
-    db_order = db.query(Order).filter(Order.id == order_id).first()
-    if db_order:
-        db_order.status = status
+    return db.query(Order).options(selectinload(Order.items)).filter(Order.user_id == user_id).all()
 
-        # Update timestamps based on status
-        now = datetime.now()
-        if status == "preparing":
-            db_order.accepted_at = now
-        elif status == "ready":
-            db_order.prepared_at = now
-        elif status == "completed":
-            db_order.delivered_at = now
+def get_user_orders_version(db: Session, user_id: int):
+    # Everything about a user's orders that can change after they are placed
+    return tuple(db.execute(select(
+        Order.id, Order.status, Order.assigned_staff_id, Order.accepted_at, Order.prepared_at, Order.delivered_at
+    ).where(Order.user_id == user_id).order_by(Order.id)).all())
 
-        db.commit()
-        db.refresh(db_order)
-    return db_order
+def get_all_orders(db: Session):
+    return db.query(Order).options(selectinload(Order.items)).order_by(Order.created_at.desc()).all()
+
+def _apply_status(db, db_order: Order, status: str):
+    was_cancelled = db_order.status == OrderStatus.CANCELLED
+    is_cancelled = status == OrderStatus.CANCELLED
+    if was_cancelled != is_cancelled:
+        analytics_service.record_order_sales(db, db_order, db_order.items, sign=-1 if is_cancelled else 1)
+
+    db_order.status = status
+    analytics_service.invalidate_staff_performance(db, db_order)
+
+    # Update timestamps based on status
+    now = datetime.now()
+    if status == "preparing":
+        db_order.accepted_at = now
+    elif status == "ready":
+        db_order.prepared_at = now
+    elif status == "completed":
+        db_order.delivered_at = now
 
 def assign_order_staff(db: Session, order_id: int, staff_id: int):
     db_order = db.query(Order).filter(Order.id == order_id).first()
     if db_order:
         db_order.assigned_staff_id = staff_id
+        analytics_service.invalidate_staff_performance(db, db_order)
         db.commit()
         db.refresh(db_order)
     return db_order
@@ -107,3 +132,92 @@ def get_daily_sales(db: Session):
         "total_sales": sales.total_sales or 0.0,
         "order_count": sales.order_count or 0
     }
+
+# Async path: one transaction per order, no blocking calls on the event loop
+async def create_order_async(db: AsyncSession, order_data: OrderCreate, user_id: int = None):
+    prices = dict((await db.execute(_menu_prices_query(order_data))).all())
+    coupon_eligible = False
+    if user_id:
+        coupon_eligible = bool(await db.scalar(select(User.coupon_eligible).where(User.id == user_id)))
+
+    db_order, items_to_create = _build_order(order_data, prices, user_id, coupon_eligible)
+    db_order.items = items_to_create
+    db.add(db_order)
+    await db.flush()
+    await db.refresh(db_order, ["created_at"])
+
+    await db.run_sync(lambda s: analytics_service.record_order_sales(s, db_order, items_to_create))
+    await db.commit()
+    return db_order
+
+async def get_order_async(db: AsyncSession, order_id: int, include_archive: bool = False):
+    result = await db.execute(select(Order).options(selectinload(Order.items)).where(Order.id == order_id))
+    db_order = result.scalar_one_or_none()
+    if db_order is None and include_archive:
+        result = await db.execute(
+            select(ArchivedOrder).options(selectinload(ArchivedOrder.items)).where(ArchivedOrder.id == order_id)
+        )
+        db_order = result.scalar_one_or_none()
+    return db_order
+
+async def update_order_status_async(db: AsyncSession, order_id: int, status: str):
+    db_order = await get_order_async(db, order_id)
+    if db_order:
+        await db.run_sync(lambda s: _apply_status(s, db_order, status))
+        await db.commit()
+    return db_order
+
+# Archival: move old completed and cancelled orders out of the live tables
+def _archivable_orders_query(cutoff: datetime, batch_size: int):
+    # The orders holding the highest order and line ids stay live, so SQLite (which hands out
+    # max(rowid) + 1) never reissues an id that already exists in the archive
+    newest_order = select(func.max(Order.id)).scalar_subquery()
+    newest_line_order = select(OrderItem.order_id).where(
+        OrderItem.id == select(func.max(OrderItem.id)).scalar_subquery()
+    ).scalar_subquery()
+    return select(Order.id).where(
+        Order.status.in_(ARCHIVABLE_STATUSES),
+        Order.created_at < cutoff,
+        Order.id < newest_order,
+        Order.id != func.coalesce(newest_line_order, 0)
+    ).order_by(Order.id).limit(batch_size)
+
+def archive_orders(
+    db: Session,
+    older_than_days: int = ORDER_ARCHIVE_AFTER_DAYS,
+    batch_size: int = ORDER_ARCHIVE_BATCH_SIZE,
+    max_batches: int = None
+):
+    cutoff = datetime.now() - timedelta(days=max(older_than_days, ORDER_ARCHIVE_MIN_DAYS))
+    order_columns = [c.name for c in Order.__table__.columns]
+    item_columns = [c.name for c in OrderItem.__table__.columns]
+    archived_orders = archived_items = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        order_ids = db.scalars(_archivable_orders_query(cutoff, batch_size)).all()
+        if not order_ids:
+            break
+
+        # One transaction per batch: copy orders and lines, then delete them from the live tables
+        db.execute(insert(ArchivedOrder).from_select(
+            order_columns, select(*Order.__table__.c).where(Order.id.in_(order_ids))
+        ))
+        result = db.execute(insert(ArchivedOrderItem).from_select(
+            item_columns, select(*OrderItem.__table__.c).where(OrderItem.order_id.in_(order_ids))
+        ))
+        db.execute(delete(OrderItem).where(OrderItem.order_id.in_(order_ids)))
+        db.execute(delete(Order).where(Order.id.in_(order_ids)))
+        db.commit()
+
+        archived_orders += len(order_ids)
+        archived_items += result.rowcount
+        batches += 1
+
+    has_more = batches == max_batches and db.scalar(_archivable_orders_query(cutoff, 1)) is not None
+    return {
+        "cutoff": cutoff.isoformat(timespec="seconds"),
+        "archived_orders": archived_orders,
+        "archived_items": archived_items,
+        "batches": batches,
+        "has_more": has_more
+    }
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from app.models.models import Review, ReviewLike, ReviewComment, ReviewImage, User
 from app.schemas.schemas import ReviewCreate, ReviewCommentCreate
 import os
@@ -29,51 +30,46 @@ def create_review(db: Session, review_data: ReviewCreate, user_id: Optional[int]
     db.refresh(db_review)
     return db_review
 
-def get_reviews_feed(db: Session, page: int = 1, limit: int = 10, current_user_id: Optional[int] = None):
-    offset = (page - 1) * limit
-
-    total_count = db.query(func.count(Review.id)).scalar()
-
-    query = db.query(Review).order_by(Review.created_at.desc()).offset(offset).limit(limit)
-    reviews = query.all()
+def _display_name(obj):
+    if obj.user:
+        return obj.user.full_name or obj.user.email.split('@')[0]
+    return obj.guest_name
+
+def _reviews_page_query(offset: int, limit: int):
+    return select(Review).options(
+        selectinload(Review.user), selectinload(Review.images)
+    ).order_by(Review.created_at.desc()).offset(offset).limit(limit)
+
+def _review_details_queries(review_ids: List[int], current_user_id: Optional[int] = None):
+    # Likes, the viewer's own likes and comments for the whole page in three queries
+    likes = select(ReviewLike.review_id, func.count(ReviewLike.id)).where(
+        ReviewLike.review_id.in_(review_ids)
+    ).group_by(ReviewLike.review_id)
+    liked = None
+    if current_user_id:
+        liked = select(ReviewLike.review_id).where(
+            ReviewLike.review_id.in_(review_ids), ReviewLike.user_id == current_user_id
+        )
+    comments = select(ReviewComment).options(selectinload(ReviewComment.user)).where(
+        ReviewComment.review_id.in_(review_ids)
+    ).order_by(ReviewComment.id)
+    return likes, liked, comments
+
+def _feed_entries(reviews, likes_counts: dict, liked_ids: set, comments):
+    comments_by_review = {}
+    for c in comments:
+        comments_by_review.setdefault(c.review_id, []).append({
+            "id": c.id,
+            "user_id": c.user_id,
+            "text": c.text,
+            "created_at": c.created_at,
+            "guest_name": c.guest_name,
+            "full_name": _display_name(c)
+        })
 
     results = []
     for review in reviews:
-        # Count likes
-        likes_count = db.query(func.count(ReviewLike.id)).filter(ReviewLike.review_id == review.id).scalar()
-
-        # Count comments
-        comments_count = db.query(func.count(ReviewComment.id)).filter(ReviewComment.review_id == review.id).scalar()
-
-        # Check if liked by current user
-        is_liked = False
-        if current_user_id:
-            is_liked = db.query(ReviewLike).filter(
-                ReviewLike.review_id == review.id,
-                ReviewLike.user_id == current_user_id
-            ).first() is not None
-
-        # Get reviewer name
-        reviewer_name = review.guest_name
-        if review.user:
-            reviewer_name = review.user.full_name or review.user.email.split('@')[0]
-
-        # Get comments
-        comments = db.query(ReviewComment).filter(ReviewComment.review_id == review.id).all()
-        comment_responses = []
-        for c in comments:
-            c_name = c.guest_name
-            if c.user:
-                c_name = c.user.full_name or c.user.email.split('@')[0]
-            comment_responses.append({
-                "id": c.id,
-                "user_id": c.user_id,
-                "text": c.text,
-                "created_at": c.created_at,
-                "guest_name": c.guest_name,
-                "full_name": c_name
-            })
-
+        review_comments = comments_by_review.get(review.id, [])
         results.append({
             "id": review.id,
             "user_id": review.user_id,
@@ -81,14 +77,16 @@ def get_reviews_feed(db: Session, page: int = 1, limit: int = 10, current_user_i
             "text": review.text,
             "created_at": review.created_at,
             "guest_name": review.guest_name,
-            "likes_count": likes_count,
-            "comments_count": comments_count,
-            "is_liked": is_liked,
+            "likes_count": likes_counts.get(review.id, 0),
+            "comments_count": len(review_comments),
+            "is_liked": review.id in liked_ids,
             "images": review.images,
-            "comments": comment_responses,
-            "full_name": reviewer_name
+            "comments": review_comments,
+            "full_name": _display_name(review)
         })
+    return results
 
+def _feed_page(results, total_count: int, page: int, limit: int):
     return {
         "reviews": results,
         "total_count": total_count,
@@ -96,6 +94,76 @@ def get_reviews_feed(db: Session, page: int = 1, limit: int = 10, current_user_i
         "pages": (total_count + limit - 1) // limit
     }
 
+def _review_entries(db: Session, reviews, current_user_id: Optional[int] = None):
+    if not reviews:
+        return []
+    likes, liked, comments = _review_details_queries([r.id for r in reviews], current_user_id)
+    likes_counts = dict(db.execute(likes).all())
+    liked_ids = set(db.execute(liked).scalars()) if liked is not None else set()
+    return _feed_entries(reviews, likes_counts, liked_ids, db.execute(comments).scalars().all())
+
+def get_reviews_feed(db: Session, page: int = 1, limit: int = 10, current_user_id: Optional[int] = None):
+    offset = (page - 1) * limit
+
+    total_count = db.scalar(select(func.count(Review.id)))
+    reviews = db.execute(_reviews_page_query(offset, limit)).scalars().all()
+
+    return _feed_page(_review_entries(db, reviews, current_user_id), total_count, page, limit)
+
+async def _review_entries_async(db: AsyncSession, reviews, current_user_id: Optional[int] = None):
+    if not reviews:
+        return []
+    likes, liked, comments = _review_details_queries([r.id for r in reviews], current_user_id)
+    likes_counts = dict((await db.execute(likes)).all())
+    liked_ids = set((await db.execute(liked)).scalars()) if liked is not None else set()
+    return _feed_entries(reviews, likes_counts, liked_ids, (await db.execute(comments)).scalars().all())
+
+def _feed_version_query(offset: int, limit: int):
+    # One round trip of indexed aggregates over the page's reviews, likes, comments and images;
+    # any like, comment, image or review change moves at least one of them (an admin renaming a
+    # user does not, and shows once the page next changes)
+    page = select(Review.id).order_by(Review.created_at.desc()).offset(offset).limit(limit).cte("page")
+    page_ids = select(page.c.id)
+    columns = [
+        select(func.count(Review.id)).scalar_subquery(),
+        select(func.sum(page.c.id)).scalar_subquery(),
+        select(func.max(page.c.id)).scalar_subquery(),
+    ]
+    for model in (ReviewLike, ReviewComment, ReviewImage):
+        for aggregate in (func.count, func.max):
+            columns.append(select(aggregate(model.id)).where(model.review_id.in_(page_ids)).scalar_subquery())
+    return select(*columns)
+
+async def get_reviews_feed_version_async(db: AsyncSession, page: int = 1, limit: int = 10):
+    return tuple((await db.execute(_feed_version_query((page - 1) * limit, limit))).one())
+
+async def get_reviews_feed_async(db: AsyncSession, page: int = 1, limit: int = 10, current_user_id: Optional[int] = None):
+    offset = (page - 1) * limit
+
+    total_count = await db.scalar(select(func.count(Review.id)))
+    reviews = (await db.execute(_reviews_page_query(offset, limit))).scalars().all()
+
+    return _feed_page(await _review_entries_async(db, reviews, current_user_id), total_count, page, limit)
+
+async def create_review_async(db: AsyncSession, review_data: ReviewCreate, user_id: Optional[int] = None, image_urls: List[str] = []):
+    db_review = Review(
+        user_id=user_id,
+        guest_name=review_data.guest_name if not user_id else None,
+        stars=review_data.stars,
+        text=review_data.text,
+        images=[ReviewImage(image_url=url) for url in image_urls]
+    )
+    db.add(db_review)
+    await db.commit()
+
+    # Reload with the relationships the feed entry reads, without lazy loads
+    result = await db.execute(
+        select(Review).options(selectinload(Review.user), selectinload(Review.images))
+        .where(Review.id == db_review.id).execution_options(populate_existing=True)
+    )
+    db_review = result.scalar_one()
+    return (await _review_entries_async(db, [db_review], user_id))[0]
+
 def toggle_like_review(db: Session, review_id: int, user_id: int):
     existing_like = db.query(ReviewLike).filter(
         ReviewLike.review_id == review_id,
@@ -140,8 +208,8 @@ def delete_review(db: Session, review_id: int):
     return False
 
 def save_upload_file(file):
-    if not os.path.exists(UPLOAD_DIR):
-        os.makedirs(UPLOAD_DIR)
+    # Several workers may get here at once
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
 
     file_extension = os.path.splitext(file.filename)[1]
     unique_filename = f"{uuid.uuid4()}{file_extension}"
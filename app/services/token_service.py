@@ -0,0 +1,102 @@
+from sqlalchemy.orm import Session
+from app.models.models import RefreshToken, RevokedToken, User
+from app.auth import security
+from app.auth.deps import invalidate_principal
+from app.auth.revocation import revocation_filter, user_key
+from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import secrets
+import uuid
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+def _issue_refresh_token(db: Session, user_id: int, family_id: str) -> str:
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=_hash_token(token),
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=security.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    return token
+
+def _token_response(user: User, refresh_token: str):
+    access_token = security.create_access_token(
+        data={"sub": user.email, "uid": user.id, "role": user.role}
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+        "expires_in": security.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+def create_session(db: Session, user: User):
+    refresh_token = _issue_refresh_token(db, user.id, uuid.uuid4().hex)
+    db.commit()
+    return _token_response(user, refresh_token)
+
+def rotate_refresh_token(db: Session, refresh_token: str):
+    db_token = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(refresh_token)).first()
+    if not db_token or db_token.expires_at.replace(tzinfo=None) < datetime.utcnow():
+        return None
+
+    now = datetime.utcnow()
+    if db_token.revoked_at is not None:
+        # A rotated token was presented again: treat the whole family as stolen
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == db_token.family_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({"revoked_at": now}, synchronize_session=False)
+        db.commit()
+        return None
+
+    user = db.query(User).filter(User.id == db_token.user_id).first()
+    if not user:
+        return None
+
+    db_token.revoked_at = now
+    new_token = _issue_refresh_token(db, user.id, db_token.family_id)
+    db.commit()
+    return _token_response(user, new_token)
+
+def _record_revocation(db: Session, key: str, expires_at: datetime):
+    now = datetime.utcnow()
+    # Entries are only needed until every token they cover has expired
+    db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+    existing = db.query(RevokedToken).filter(RevokedToken.key == key).first()
+    if existing:
+        existing.revoked_at = now
+        existing.expires_at = max(existing.expires_at.replace(tzinfo=None), expires_at)
+    else:
+        db.add(RevokedToken(key=key, revoked_at=now, expires_at=expires_at))
+    revocation_filter.add(key)
+
+def logout(db: Session, access_payload: Optional[dict], refresh_token: Optional[str] = None):
+    if access_payload and access_payload.get("jti"):
+        _record_revocation(db, access_payload["jti"], datetime.utcfromtimestamp(access_payload["exp"]))
+    if refresh_token:
+        db_token = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(refresh_token)).first()
+        if db_token:
+            db.query(RefreshToken).filter(
+                RefreshToken.family_id == db_token.family_id,
+                RefreshToken.revoked_at.is_(None)
+            ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+    db.commit()
+
+def revoke_user_access(db: Session, user_id: int):
+    # Every worker rejects the user's access tokens issued until now; the caller commits
+    _record_revocation(
+        db, user_key(user_id), datetime.utcnow() + timedelta(minutes=security.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+def revoke_user_sessions(db: Session, user_id: int):
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked_at.is_(None)
+    ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+    revoke_user_access(db, user_id)
+    db.commit()
+    invalidate_principal(user_id)
@@ -1,13 +1,15 @@
 from sqlalchemy.orm import Session
-from app.models.models import User
-from app.schemas.schemas import UserCreate
+from app.models.models import User, Review, ReviewComment, ReviewLike, RefreshToken, ArchivedOrder
+from app.schemas.schemas import UserCreate, UserAdminUpdate
 from app.auth.security import get_password_hash
+from app.auth.deps import invalidate_principal
+from app.services import token_service
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: str = None):
+    hashed_password = hashed_password or get_password_hash(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -17,3 +19,44 @@ def create_user(db: Session, user: UserCreate):
     db.commit()
     db.refresh(db_user)
     return db_user
+
+def update_password_hash(db: Session, db_user: User, hashed_password: str):
+    db_user.hashed_password = hashed_password
+    db.commit()
+    return db_user
+
+def get_users(db: Session):
+    return db.query(User).order_by(User.id).all()
+
+def update_user(db: Session, user_id: int, user_data: UserAdminUpdate):
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if not db_user:
+        return None
+    role_changed = user_data.role is not None and user_data.role != db_user.role
+    for key, value in user_data.model_dump(exclude_unset=True).items():
+        setattr(db_user, key, value)
+    if role_changed:
+        # Tokens carry the role as a claim; a refresh issues one with the new role
+        token_service.revoke_user_access(db, db_user.id)
+    db.commit()
+    db.refresh(db_user)
+    if role_changed:
+        invalidate_principal(db_user.id)
+    return db_user
+
+def delete_user(db: Session, user_id: int):
+    db_user = db.query(User).filter(User.id == user_id).first()
+    if db_user:
+        # Foreign keys are enforced: keep the user's reviews and comments as anonymous, drop the rest
+        db.query(Review).filter(Review.user_id == user_id).update({"user_id": None}, synchronize_session=False)
+        db.query(ReviewComment).filter(ReviewComment.user_id == user_id).update({"user_id": None}, synchronize_session=False)
+        # Live orders are detached through the relationship; archived ones have none
+        db.query(ArchivedOrder).filter(ArchivedOrder.user_id == user_id).update({"user_id": None}, synchronize_session=False)
+        db.query(ReviewLike).filter(ReviewLike.user_id == user_id).delete(synchronize_session=False)
+        db.query(RefreshToken).filter(RefreshToken.user_id == user_id).delete(synchronize_session=False)
+        token_service.revoke_user_access(db, user_id)
+        db.delete(db_user)
+        db.commit()
+        invalidate_principal(user_id)
+        return True
+    return False
@@ -0,0 +1,124 @@
+"""Build fingerprinted, precompressed copies of the HTML pages and static assets.
+
+    python -m app.static_build [--output build/static]
+
+CSS, JS and SVG files under assets/ and admin/ are written under content-hashed names
+(auth.js -> auth.<hash>.js, also kept under the plain name), the HTML pages are rewritten to
+reference the hashed names, and every text file gets .gz and .br variants next to it (.br
+needs the brotli package). The app serves from the output directory when it exists, so rerun
+this and restart the app after changing any page or asset. Run from the repository root.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from app.static_files import STATIC_BUILD_DIR, STATIC_MANIFEST
+
+ASSET_DIRS = ("assets", "admin")
+FINGERPRINT_EXTENSIONS = (".css", ".js", ".svg")
+COMPRESS_EXTENSIONS = (".html", ".css", ".js", ".svg", ".json")
+# Smaller files gain nothing from compression once headers are counted
+COMPRESS_MIN_BYTES = 1024
+HASH_LENGTH = 12
+
+_REFERENCE = re.compile(r"""(\b(?:src|href)=["'])([^"'?#]+)""")
+
+def _digest(data: bytes, length: int = HASH_LENGTH):
+    return hashlib.sha256(data).hexdigest()[:length]
+
+def _fingerprinted(path: str, data: bytes):
+    stem, ext = posixpath.splitext(path)
+    return f"{stem}.{_digest(data)}{ext}"
+
+def _source_files():
+    for top in ASSET_DIRS:
+        for root, _, files in os.walk(top):
+            for name in sorted(files):
+                yield posixpath.join(*os.path.normpath(os.path.join(root, name)).split(os.sep))
+
+def _pages():
+    pages = sorted(name for name in os.listdir(".") if name.endswith(".html"))
+    return pages + [path for path in _source_files() if path.endswith(".html")]
+
+def _rewrite_references(page: str, html: str, hashed: dict):
+    base = posixpath.dirname(page)
+
+    def replace(match):
+        prefix, target = match.groups()
+        if re.match(r"^(?:[a-z][a-z0-9+.-]*:|//)", target, re.I):
+            return match.group(0)
+        logical = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(base, target))
+        if logical not in hashed:
+            return match.group(0)
+        return prefix + target[:len(target) - len(posixpath.basename(target))] + posixpath.basename(hashed[logical])
+
+    return _REFERENCE.sub(replace, html)
+
+def _write(output: str, path: str, data: bytes, etags: dict):
+    target = os.path.join(output, *path.split("/"))
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    variants = [(path, data)]
+    if path.endswith(COMPRESS_EXTENSIONS) and len(data) >= COMPRESS_MIN_BYTES:
+        variants.append((path + ".gz", gzip.compress(data, compresslevel=9, mtime=0)))
+        if brotli is not None:
+            variants.append((path + ".br", brotli.compress(data, quality=11)))
+
+    for variant_path, payload in variants:
+        # A variant that is not smaller than the original is never worth serving
+        if variant_path != path and len(payload) >= len(data):
+            continue
+        with open(os.path.join(output, *variant_path.split("/")), "wb") as f:
+            f.write(payload)
+        etags[variant_path] = _digest(payload, 16)
+
+    # Drop variants left by an earlier build so they cannot shadow the new content
+    for suffix in (".gz", ".br"):
+        if path + suffix not in etags and os.path.exists(target + suffix):
+            os.remove(target + suffix)
+
+def build(output: str = STATIC_BUILD_DIR):
+    hashed, etags = {}, {}
+
+    for path in _source_files():
+        if not path.endswith(FINGERPRINT_EXTENSIONS):
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        hashed[path] = _fingerprinted(path, data)
+        for target in (hashed[path], path):
+            _write(output, target, data, etags)
+
+    for page in _pages():
+        with open(page, encoding="utf-8") as f:
+            html = _rewrite_references(page, f.read(), hashed)
+        _write(output, page, html.encode("utf-8"), etags)
+
+    with open(os.path.join(output, STATIC_MANIFEST), "w") as f:
+        json.dump({"assets": hashed, "etags": etags}, f, indent=2, sort_keys=True)
+        f.write("\n")
+    return {"assets": len(hashed), "pages": len(_pages()), "files": len(etags)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=STATIC_BUILD_DIR)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed; writing gzip variants only")
+    result = build(args.output)
+    print(
+        f"{result['assets']} fingerprinted assets, {result['pages']} pages, {result['files']} files "
+        f"written to {args.output}"
+    )
+
+if __name__ == "__main__":
+    main()
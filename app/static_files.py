@@ -0,0 +1,192 @@
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from functools import lru_cache
+from email.utils import parsedate
+from math import ceil
+from urllib.parse import parse_qs
+import json
+import mimetypes
+import os
+import re
+
+# Output of `python -m app.static_build`; served in preference to the source files when present
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR", "build/static")
+STATIC_MANIFEST = "asset-manifest.json"
+
+# Preferred first; each maps to the suffix of the prebuilt variant
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+FINGERPRINTED = re.compile(r"\.[0-9a-f]{12}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Output of `python -m app.image_build`; resized JPEG/WebP variants served in place of originals
+IMAGE_BUILD_DIR = os.getenv("IMAGE_BUILD_DIR", "build/images")
+IMAGE_MANIFEST = "image-manifest.json"
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+# Pages opt in to width hints so browsers send them with image requests
+ACCEPT_CH = "Sec-CH-Width, Sec-CH-Viewport-Width, Sec-CH-DPR"
+IMAGE_VARY = "Accept, Sec-CH-Width, Sec-CH-Viewport-Width, Sec-CH-DPR"
+
+@lru_cache(maxsize=1)
+def _content_etags():
+    try:
+        with open(os.path.join(STATIC_BUILD_DIR, STATIC_MANIFEST)) as f:
+            return json.load(f).get("etags", {})
+    except FileNotFoundError:
+        return {}
+
+@lru_cache(maxsize=1)
+def _image_variants():
+    try:
+        with open(os.path.join(IMAGE_BUILD_DIR, IMAGE_MANIFEST)) as f:
+            return json.load(f)["images"]
+    except FileNotFoundError:
+        return {}
+
+def _accepted_encodings(accept_encoding: str):
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+def _negotiate(full_path: str, accept_encoding: str):
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding, suffix in ENCODINGS:
+        if (encoding in accepted or "*" in accepted) and os.path.isfile(full_path + suffix):
+            return full_path + suffix, encoding
+    return full_path, None
+
+def _content_etag(served_path: str):
+    build_root = os.path.realpath(STATIC_BUILD_DIR)
+    real_path = os.path.realpath(served_path)
+    if os.path.commonpath([real_path, build_root]) != build_root:
+        return None
+    digest = _content_etags().get(os.path.relpath(real_path, build_root).replace(os.sep, "/"))
+    return f'"{digest}"' if digest else None
+
+def _is_not_modified(response_headers, request_headers: Headers):
+    if if_none_match := request_headers.get("if-none-match"):
+        if if_none_match.strip() == "*":
+            return True
+        return response_headers["etag"] in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if_modified_since = parsedate(request_headers.get("if-modified-since", ""))
+    last_modified = parsedate(response_headers.get("last-modified", ""))
+    return bool(if_modified_since and last_modified and if_modified_since >= last_modified)
+
+def static_response(
+    full_path: str,
+    request_headers: Headers,
+    stat_result: os.stat_result = None,
+    cache_control: str = None,
+    vary: str = "Accept-Encoding"
+):
+    """Serve a file, or its prebuilt brotli/gzip variant when the client accepts one.
+
+    Fingerprinted names are cached for a year as immutable; everything else must revalidate,
+    answered with 304 when the ETag (content hash from the build manifest, else FileResponse's
+    mtime/size tag) still matches.
+    """
+    served_path, encoding = _negotiate(full_path, request_headers.get("accept-encoding", ""))
+    # FileResponse only sets ETag and Last-Modified up front when it is given the stat result
+    if encoding or stat_result is None:
+        stat_result = os.stat(served_path)
+    response = FileResponse(
+        served_path,
+        media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+        stat_result=stat_result
+    )
+    if encoding:
+        response.headers["content-encoding"] = encoding
+    response.headers["vary"] = vary
+    response.headers["cache-control"] = cache_control or (
+        IMMUTABLE_CACHE_CONTROL if FINGERPRINTED.search(full_path) else REVALIDATE_CACHE_CONTROL
+    )
+    if etag := _content_etag(served_path):
+        response.headers["etag"] = etag
+
+    if _is_not_modified(response.headers, request_headers):
+        return NotModifiedResponse(response.headers)
+    return response
+
+def _header_number(headers: Headers, *names: str):
+    for name in names:
+        try:
+            return float(headers[name])
+        except (KeyError, ValueError):
+            continue
+    return None
+
+def requested_image_width(headers: Headers, query_width: int = None):
+    # Device pixels the image will be drawn at, from ?w= or client hints; None when unknown
+    if query_width:
+        return query_width
+    width = _header_number(headers, "sec-ch-width", "width")
+    if width:
+        return ceil(width)
+    viewport = _header_number(headers, "sec-ch-viewport-width", "viewport-width")
+    if viewport:
+        return ceil(viewport * (_header_number(headers, "sec-ch-dpr", "dpr") or 1.0))
+    return None
+
+def pick_image_variant(source: str, accept: str, width: int = None):
+    """Pick the built variant of a source image for a client, or None to serve the original.
+
+    WebP when the Accept header lists it, otherwise JPEG; the narrowest variant at least
+    `width` device pixels wide, or the widest when no width is known or none is wide enough.
+    """
+    entry = _image_variants().get(source)
+    if not entry:
+        return None
+    fmt = "webp" if "image/webp" in accept else "jpeg"
+    candidates = sorted((v for v in entry["variants"] if v["format"] == fmt), key=lambda v: v["width"])
+    if not candidates:
+        return None
+    variant = next((v for v in candidates if width and v["width"] >= width), candidates[-1])
+    # A re-encoded full-size JPEG can come out larger than a well-compressed original
+    return variant if variant["bytes"] < entry["size"] else None
+
+def resolve_built(path: str):
+    # The built copy of a page references the fingerprinted assets, so it wins when present
+    built = os.path.join(STATIC_BUILD_DIR, path)
+    return built if os.path.isfile(built) else path
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that also looks in the build output and serves through static_response."""
+
+    def __init__(self, *, directory: str, build_directory: str = None, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        if build_directory and os.path.isdir(build_directory):
+            self.all_directories = [build_directory, *self.all_directories]
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        return static_response(str(full_path), Headers(scope=scope), stat_result)
+
+class ResponsiveImageFiles(PrecompressedStaticFiles):
+    """Serves the best built variant of an image instead of the original, by Accept and width hints."""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        headers = Headers(scope=scope)
+        source = os.path.relpath(str(full_path), os.path.realpath(".")).replace(os.sep, "/")
+        query_width = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("w", [None])[0]
+        variant = pick_image_variant(
+            source,
+            headers.get("accept", ""),
+            requested_image_width(headers, int(query_width) if query_width and query_width.isdigit() else None)
+        )
+        if variant is None:
+            return super().file_response(full_path, stat_result, scope, status_code)
+        return static_response(
+            os.path.join(IMAGE_BUILD_DIR, *variant["path"].split("/")),
+            headers,
+            cache_control=IMAGE_CACHE_CONTROL,
+            vary=IMAGE_VARY
+        )
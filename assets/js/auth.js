@@ -8,6 +8,8 @@ const API_BASE_URL = window.location.hostname === 'localhost' || window.location
     : 'https://api.malumenico.com'; // Placeholder for production URL
 
 const AUTH_KEY = 'malume_nico_auth_token';
+const REFRESH_KEY = 'malume_nico_refresh_token';
+const EXPIRES_KEY = 'malume_nico_token_expires_at';
 const USER_KEY = 'malume_nico_user_data';
 
 const Auth = {
@@ -26,6 +28,83 @@ const Auth = {
         return localStorage.getItem(AUTH_KEY);
     },
 
+    /**
+     * Store a token pair returned by /auth/login or /auth/refresh
+     */
+    storeTokens: function(data) {
+        localStorage.setItem(AUTH_KEY, data.access_token);
+        if (data.refresh_token) localStorage.setItem(REFRESH_KEY, data.refresh_token);
+        if (data.expires_in) localStorage.setItem(EXPIRES_KEY, String(Date.now() + data.expires_in * 1000));
+        this.scheduleRefresh();
+    },
+
+    /**
+     * Exchange the refresh token for a new token pair. Concurrent callers share one request:
+     * presenting an already rotated refresh token again revokes the whole session
+     */
+    refresh: function() {
+        if (!this._refreshing) {
+            this._refreshing = this._refresh().finally(() => { this._refreshing = null; });
+        }
+        return this._refreshing;
+    },
+
+    _refresh: async function() {
+        const refreshToken = localStorage.getItem(REFRESH_KEY);
+        if (!refreshToken) return false;
+        try {
+            const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ refresh_token: refreshToken })
+            });
+            if (!response.ok) {
+                this.clearSession();
+                return false;
+            }
+            this.storeTokens(await response.json());
+            return true;
+        } catch (error) {
+            return false;
+        }
+    },
+
+    /**
+     * Refresh the access token shortly before it expires
+     */
+    scheduleRefresh: function() {
+        clearTimeout(this._refreshTimer);
+        const expiresAt = parseInt(localStorage.getItem(EXPIRES_KEY) || '0', 10);
+        if (!expiresAt || !localStorage.getItem(REFRESH_KEY)) return;
+        const delay = Math.max(expiresAt - Date.now() - 60000, 0);
+        this._refreshTimer = setTimeout(() => this.refresh(), delay);
+    },
+
+    /**
+     * Whether the stored access token has expired or is about to
+     */
+    isTokenExpired: function() {
+        const expiresAt = parseInt(localStorage.getItem(EXPIRES_KEY) || '0', 10);
+        return Boolean(expiresAt) && expiresAt - Date.now() < 5000;
+    },
+
+    /**
+     * Refresh first when the stored access token has expired; resolves to the token to send
+     */
+    ensureFreshToken: async function() {
+        if (this.getToken() && this.isTokenExpired() && localStorage.getItem(REFRESH_KEY)) {
+            await this.refresh();
+        }
+        return this.getToken();
+    },
+
+    clearSession: function() {
+        localStorage.removeItem(AUTH_KEY);
+        localStorage.removeItem(REFRESH_KEY);
+        localStorage.removeItem(EXPIRES_KEY);
+        localStorage.removeItem(USER_KEY);
+    },
+
     /**
      * Check if a user is logged in
      */
@@ -77,7 +156,7 @@ const Auth = {
             }
 
             const data = await response.json();
-            localStorage.setItem(AUTH_KEY, data.access_token);
+            this.storeTokens(data);
 
             // Get user profile
             const profileResponse = await fetch(`${API_BASE_URL}/auth/me`, {
@@ -105,9 +184,21 @@ const Auth = {
     /**
      * Logout
      */
-    logout: function() {
-        localStorage.removeItem(AUTH_KEY);
-        localStorage.removeItem(USER_KEY);
+    logout: async function() {
+        const token = this.getToken();
+        try {
+            await fetch(`${API_BASE_URL}/auth/logout`, {
+                method: 'POST',
+                headers: Object.assign(
+                    { 'Content-Type': 'application/json' },
+                    token ? { 'Authorization': `Bearer ${token}` } : {}
+                ),
+                body: JSON.stringify({ refresh_token: localStorage.getItem(REFRESH_KEY) })
+            });
+        } catch (error) {
+            // Still clear the local session when offline
+        }
+        this.clearSession();
         window.location.reload();
     },
 
@@ -142,4 +233,25 @@ const Auth = {
 
 if (typeof window !== 'undefined') {
     window.Auth = Auth;
+    Auth.scheduleRefresh();
+
+    // Requests sent with the stored access token get a fresh one when it has expired (the
+    // scheduled refresh does not run while the page is closed), and are retried once after a
+    // refresh when the API still answers 401, e.g. after a role change revoked the token
+    const nativeFetch = window.fetch.bind(window);
+    window.fetch = async function(input, init = {}) {
+        const headers = new Headers(init.headers || {});
+        const sentToken = (headers.get('Authorization') || '').replace(/^Bearer /, '');
+        if (!sentToken || sentToken !== Auth.getToken()) return nativeFetch(input, init);
+
+        const send = (token) => {
+            headers.set('Authorization', `Bearer ${token}`);
+            return nativeFetch(input, Object.assign({}, init, { headers }));
+        };
+        const token = await Auth.ensureFreshToken();
+        if (!token) return nativeFetch(input, init);
+        const response = await send(token);
+        if (response.status !== 401 || !(await Auth.refresh())) return response;
+        return send(Auth.getToken());
+    };
 }
@@ -0,0 +1,122 @@
+"""Compare the sync (threadpool) and async (AsyncSession) paths for the hot endpoints under load.
+
+    python -m benchmarks.async_load [--requests 400] [--concurrency 1,10,50,100]
+
+Both paths run in one in-process ASGI app against the same fresh on-disk SQLite database:
+order creation plus review feed reads, at each concurrency level, reporting throughput and
+p50/p99 latency.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+# The engines are built from the environment at import time
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.database import Base, engine, get_db, get_read_db, SessionLocal
+from app.database.async_database import get_async_db, get_async_read_db
+from app.models.models import MenuItem, Review
+from app.schemas.schemas import OrderCreate
+from app.services import order_service, review_service
+from benchmarks.common import percentile
+
+def build_app():
+    app = FastAPI()
+
+    @app.post("/sync/order")
+    def sync_order(order: OrderCreate, db: Session = Depends(get_db)):
+        return {"id": order_service.create_order(db, order).id}
+
+    @app.post("/async/order")
+    async def async_order(order: OrderCreate, db: AsyncSession = Depends(get_async_db)):
+        return {"id": (await order_service.create_order_async(db, order)).id}
+
+    @app.get("/sync/feed")
+    def sync_feed(db: Session = Depends(get_read_db)):
+        return review_service.get_reviews_feed(db)["total_count"]
+
+    @app.get("/async/feed")
+    async def async_feed(db: AsyncSession = Depends(get_async_read_db)):
+        return (await review_service.get_reviews_feed_async(db))["total_count"]
+
+    return app
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    items = [MenuItem(name=f"Item {i}", price=20.0 + i, category="mains") for i in range(20)]
+    db.add_all(items)
+    db.add_all(Review(guest_name="bench", stars=5, text="bench") for _ in range(200))
+    db.commit()
+    ids = [item.id for item in items]
+    db.close()
+    return ids
+
+async def drive(client, path: str, total: int, concurrency: int, menu_ids):
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(total):
+        queue.put_nowait(i)
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            if path.endswith("order"):
+                response = await client.post(path, json={
+                    "customer_name": "bench", "customer_phone": "0", "order_type": "pickup",
+                    "items": [{"menu_item_id": menu_ids[i % len(menu_ids)], "quantity": 1},
+                              {"menu_item_id": menu_ids[(i + 7) % len(menu_ids)], "quantity": 2}]
+                })
+            else:
+                response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "errors": errors,
+    }
+
+async def run(total: int, levels):
+    menu_ids = seed()
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in ("order", "feed"):
+            for concurrency in levels:
+                for path in (f"/sync/{endpoint}", f"/async/{endpoint}"):
+                    result = await drive(client, path, total, concurrency, menu_ids)
+                    print(
+                        f"{path:<14} c={concurrency:<5} rps={result['rps']:<9} "
+                        f"p50={result['p50_ms']:<8}ms p99={result['p99_ms']:<8}ms errors={result['errors']}"
+                    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", default="1,10,50,100")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, [int(c) for c in args.concurrency.split(",")]))
+
+if __name__ == "__main__":
+    main()
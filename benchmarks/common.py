@@ -0,0 +1,4 @@
+def percentile(values, q: float):
+    # Nearest-rank percentile of an unsorted sample
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
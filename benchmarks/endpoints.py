@@ -0,0 +1,245 @@
+"""Drive the API endpoints in-process against a seeded database and record a JSON baseline.
+
+    python -m benchmarks.seed --database-url sqlite:///bench.db
+    python -m benchmarks.endpoints --database-url sqlite:///bench.db --output baseline.json
+    python -m benchmarks.endpoints --database-url sqlite:///bench.db --compare baseline.json [--threshold 0.2]
+
+Each endpoint gets --requests requests at --concurrency through an ASGI client, recording
+p50/p95/p99 latency, throughput and queries per request (from the Server-Timing header, so
+streamed responses only count queries run before the first byte). A
+second, sequential pass under tracemalloc records peak Python memory per request. Compare mode
+exits non-zero when any endpoint's p95 grows by more than --threshold or it runs more queries
+than the baseline. Run from the repository root; order creation writes to the database.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import re
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from benchmarks.common import percentile
+
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+def endpoints(ctx):
+    today = date.today()
+    month_ago = (today - timedelta(days=30)).isoformat()
+    rng = random.Random(7)
+
+    def order_body(i):
+        return {
+            "customer_name": "Bench", "customer_phone": "0700000000", "order_type": "pickup",
+            "items": [{"menu_item_id": rng.choice(ctx["menu_ids"]), "quantity": 1 + i % 3} for _ in range(2)],
+        }
+
+    # name -> (method, path factory, role or None, body factory or None)
+    return {
+        "reviews.feed": ("GET", lambda i: "/reviews/feed?limit=10", None, None),
+        "reviews.feed.deep_page": ("GET", lambda i: "/reviews/feed?page=500&limit=10", None, None),
+        "reviews.feed.signed_in": ("GET", lambda i: "/reviews/feed?limit=10", "customer", None),
+        "orders.status": ("GET", lambda i: f"/orders/status/{rng.randrange(1, ctx['max_order_id'] + 1)}", None, None),
+        "orders.user": ("GET", lambda i: "/orders/user", "customer", None),
+        "orders.create": ("POST", lambda i: "/orders/create", "customer", order_body),
+        "admin.dashboard.stats": ("GET", lambda i: "/admin/dashboard/stats", "admin", None),
+        "admin.dashboard.graph": ("GET", lambda i: "/admin/dashboard/graph", "admin", None),
+        "admin.sales": ("GET", lambda i: "/admin/sales", "admin", None),
+        "admin.staff": ("GET", lambda i: f"/admin/staff?start_date={month_ago}", "admin", None),
+        "admin.finance.summary": ("GET", lambda i: "/admin/finance/summary", "admin", None),
+        "admin.finance.report": ("GET", lambda i: "/admin/finance/report", "admin", None),
+        "admin.finance.pnl": ("GET", lambda i: "/admin/finance/pnl", "admin", None),
+        "admin.finance.expenses": ("GET", lambda i: "/admin/finance/expenses?limit=50", "admin", None),
+        "admin.tasks": ("GET", lambda i: "/admin/tasks?limit=50", "admin", None),
+        "admin.tasks.today": ("GET", lambda i: "/admin/tasks/today", "admin", None),
+        "admin.milestones": ("GET", lambda i: "/admin/milestones?limit=50", "admin", None),
+        "admin.analytics.top_sellers": ("GET", lambda i: f"/admin/analytics/menu/top-sellers?start_date={month_ago}", "admin", None),
+        "admin.analytics.by_category": ("GET", lambda i: "/admin/analytics/menu/revenue-by-category", "admin", None),
+        "admin.analytics.staff": ("GET", lambda i: "/admin/analytics/staff", "admin", None),
+        "admin.users": ("GET", lambda i: "/admin/users", "admin", None),
+        "admin.export.orders.day": ("GET", lambda i: f"/admin/export/orders?start_date={today.isoformat()}", "admin", None),
+    }
+
+def prepare_context():
+    # Imported lazily: the engines read DATABASE_URL at import time
+    from sqlalchemy import func, select
+    from app.auth.security import create_access_token
+    from app.database.database import SessionLocal
+    from app.models.models import MenuItem, Order, User
+
+    db = SessionLocal()
+    try:
+        headers = {}
+        for role in ("admin", "customer"):
+            if role == "customer":
+                user_id = db.scalar(
+                    select(Order.user_id).where(Order.user_id.isnot(None))
+                    .group_by(Order.user_id).order_by(func.count().desc()).limit(1)
+                )
+                user = db.get(User, user_id) if user_id else None
+            else:
+                user = None
+            if user is None:
+                email = f"bench-{role}@bench.example.com"
+                user = db.scalar(select(User).where(User.email == email))
+                if user is None:
+                    user = User(email=email, hashed_password="!", role=role, full_name=f"Bench {role}")
+                    db.add(user)
+                    db.commit()
+            token = create_access_token(
+                {"sub": user.email, "uid": user.id, "role": user.role}, expires_delta=timedelta(hours=12)
+            )
+            headers[role] = {"Authorization": f"Bearer {token}"}
+
+        return {
+            "headers": headers,
+            "menu_ids": list(db.scalars(select(MenuItem.id))),
+            "max_order_id": db.scalar(select(func.max(Order.id))) or 1,
+        }
+    finally:
+        db.close()
+
+def percentile_ms(values, q):
+    return round(percentile(values, q) * 1000, 2)
+
+async def measure(client, spec, ctx, total: int, concurrency: int):
+    method, path, role, body = spec
+    headers = ctx["headers"][role] if role else {}
+    latencies, queries, statuses = [], [], {}
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            response = await client.request(method, path(i), headers=headers, json=body(i) if body else None)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            match = _QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                queries.append(int(match.group(1)))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": total,
+        "rps": round(total / elapsed, 1),
+        "p50_ms": percentile_ms(latencies, 0.50),
+        "p95_ms": percentile_ms(latencies, 0.95),
+        "p99_ms": percentile_ms(latencies, 0.99),
+        "queries": max(queries) if queries else None,
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+    }
+
+async def peak_memory(client, spec, ctx, total: int):
+    method, path, role, body = spec
+    headers = ctx["headers"][role] if role else {}
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(total):
+        response = await client.request(method, path(i), headers=headers, json=body(i) if body else None)
+        await response.aread()
+    return round((tracemalloc.get_traced_memory()[1] - baseline) / 1024, 1)
+
+async def run(args):
+    import httpx
+    import main as app_main
+
+    # Slow-request warnings would drown the report; query counts come from Server-Timing instead
+    logging.getLogger("app.sql").setLevel(logging.ERROR)
+    ctx = prepare_context()
+    specs = endpoints(ctx)
+    if args.only:
+        specs = {name: spec for name, spec in specs.items() if any(name.startswith(p) for p in args.only)}
+
+    results = {}
+    # Server errors are recorded as 500s rather than aborting the run
+    transport = httpx.ASGITransport(app=app_main.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name, spec in specs.items():
+            # Warm caches and connection pools before timing
+            await measure(client, spec, ctx, min(args.requests, 5), 1)
+            results[name] = await measure(client, spec, ctx, args.requests, args.concurrency)
+            print(
+                f"{name:<32} p50={results[name]['p50_ms']:>8}ms p95={results[name]['p95_ms']:>8}ms "
+                f"p99={results[name]['p99_ms']:>8}ms rps={results[name]['rps']:>8} "
+                f"queries={results[name]['queries']}", flush=True
+            )
+
+        if args.memory_requests:
+            tracemalloc.start()
+            for name, spec in specs.items():
+                results[name]["peak_kib"] = await peak_memory(client, spec, ctx, args.memory_requests)
+            tracemalloc.stop()
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database_backend(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "endpoints": results,
+    }
+
+def database_backend():
+    from app.database.database import engine
+    return engine.dialect.name
+
+def compare(baseline: dict, current: dict, threshold: float):
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        change = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] if before["p95_ms"] else 0.0
+        flags = []
+        if change > threshold:
+            flags.append(f"p95 +{change:.0%}")
+        if before.get("queries") is not None and now.get("queries") is not None and now["queries"] > before["queries"]:
+            flags.append(f"queries {before['queries']} -> {now['queries']}")
+        print(f"{name:<32} p95 {before['p95_ms']:>8} -> {now['p95_ms']:>8}ms ({change:+.0%})  {'REGRESSION: ' + ', '.join(flags) if flags else 'ok'}")
+        if flags:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--memory-requests", type=int, default=5, help="requests per endpoint in the tracemalloc pass; 0 skips it")
+    parser.add_argument("--only", nargs="*", help="endpoint name prefixes to run")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95 growth before a regression is reported")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("SQL_INSTRUMENTATION_ENABLED", "true")
+
+    current = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} endpoint(s) regressed")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Bulk-load a large, realistic synthetic dataset for benchmarking.
+
+    python -m benchmarks.seed --database-url sqlite:///bench.db [--scale 1.0] [--years 3] [--seed 42]
+
+At scale 1.0: 100k users, 1M orders (~2.5M order lines), 200k reviews with likes, comments and
+images, 40 staff with daily attendance and several expenses a day over --years years, plus
+budgets, tasks and milestones. The schema is created with the Alembic migrations, rows are
+written with Core executemany in large batches, and the same --seed always yields the same data.
+"""
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import Session
+from alembic import command
+from alembic.config import Config
+from app.database.database import apply_sqlite_pragmas
+from app.models.models import (
+    User, MenuItem, Staff, Attendance, Order, OrderItem, Review, ReviewLike, ReviewComment,
+    ReviewImage, Expense, Budget, Task, Milestone, OrderStatus
+)
+from app.services import analytics_service
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import time
+
+BATCH_SIZE = 10000
+
+# Every seeded user shares one precomputed hash of "benchmark"; hashing 100k passwords would dominate the run
+PASSWORD_HASH = "$2b$04$CdE70DCyPgZkH66j6GSLmOy7eWm3gSnSJm3.zhYHpqImf5HAzlpU2"
+
+MENU = {
+    "mains": [("Pap and Vleis", 95.0), ("Chicken Dust", 85.0), ("Kota", 55.0), ("Braai Platter", 180.0),
+              ("Boerewors Roll", 45.0), ("Lamb Chops", 150.0), ("Beef Stew", 110.0), ("Mogodu", 90.0)],
+    "sides": [("Chakalaka", 25.0), ("Chips", 30.0), ("Pap", 20.0), ("Coleslaw", 22.0), ("Dombolo", 18.0)],
+    "drinks": [("Coke 500ml", 20.0), ("Sparletta", 18.0), ("Amasi", 25.0), ("Rooibos", 15.0), ("Castle Lager", 30.0)],
+    "desserts": [("Malva Pudding", 40.0), ("Koeksister", 15.0), ("Milk Tart", 35.0)],
+}
+EXPENSE_CATEGORIES = {"stock": (500, 4000), "utilities": (200, 1500), "wages": (1000, 6000),
+                      "maintenance": (100, 2500), "marketing": (100, 1200), "transport": (50, 800)}
+STAFF_ROLES = ["chef", "chef", "cashier", "waiter", "waiter", "delivery", "cleaner", "manager"]
+REVIEW_TEXTS = ["Best kota in town", "Service was slow but the food was worth it", "Great vibe on Sundays",
+                "Portions are huge", "Chicken dust is a must", "Friendly staff", "Will come back",
+                "A bit pricey", "Delivery arrived hot", "Music was too loud"]
+
+def batched(rows, size: int = BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def load(engine, model, rows) -> int:
+    table = model.__table__
+    count = 0
+    for batch in batched(rows):
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        count += len(batch)
+    return count
+
+def random_moment(rng, start: datetime, end: datetime) -> datetime:
+    # Weighted to lunch and dinner hours, and later days (the business grows)
+    span_days = (end - start).days
+    day = start + timedelta(days=int(span_days * rng.random() ** 0.7))
+    hour = rng.choice([11, 12, 12, 13, 13, 14, 17, 18, 18, 19, 19, 20, 21])
+    return day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+
+def seed(database_url: str, scale: float, years: int, seed_value: int):
+    rng = random.Random(seed_value)
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        # Bulk-load settings: durability does not matter for a throwaway dataset
+        event.listen(engine, "connect", lambda conn, record: apply_sqlite_pragmas(
+            conn, {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -262144, "temp_store": "MEMORY"}
+        ))
+
+    config = Config(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    command.upgrade(config, "head")
+
+    now = datetime.now().replace(microsecond=0)
+    start = now - timedelta(days=365 * years)
+    n_users = int(100_000 * scale)
+    n_orders = int(1_000_000 * scale)
+    n_reviews = int(200_000 * scale)
+    counts = {}
+
+    def step(name, model, rows):
+        started = time.perf_counter()
+        counts[name] = load(engine, model, rows)
+        print(f"{name:<16} {counts[name]:>10,} rows  {time.perf_counter() - started:6.1f}s", flush=True)
+
+    menu = [(i + 1, name, price, category) for i, (category, name, price) in enumerate(
+        (category, name, price) for category, items in MENU.items() for name, price in items
+    )]
+    step("menu_items", MenuItem, (
+        {"id": i, "name": name, "price": price, "category": category, "description": None,
+         "image_url": None, "is_active": True}
+        for i, name, price, category in menu
+    ))
+
+    step("users", User, (
+        {"id": i, "email": f"user{i}@bench.example.com", "hashed_password": PASSWORD_HASH,
+         "full_name": f"Bench User {i}", "role": "customer", "coupon_eligible": rng.random() < 0.3,
+         "created_at": random_moment(rng, start, now)}
+        for i in range(1, n_users + 1)
+    ))
+
+    n_staff = 40
+    step("staff", Staff, (
+        {"id": i, "name": f"Staff {i}", "role": STAFF_ROLES[i % len(STAFF_ROLES)],
+         "salary": rng.randrange(4000, 15000), "contact_info": None, "employment_status": "active",
+         "created_at": start}
+        for i in range(1, n_staff + 1)
+    ))
+
+    line_id = 0
+    order_lines = []
+
+    def orders():
+        nonlocal line_id
+        for order_id in range(1, n_orders + 1):
+            created_at = random_moment(rng, start, now)
+            recent = now - created_at < timedelta(hours=3)
+            if recent:
+                status = rng.choice([OrderStatus.PENDING, OrderStatus.PREPARING, OrderStatus.READY])
+            else:
+                status = OrderStatus.CANCELLED if rng.random() < 0.08 else OrderStatus.COMPLETED
+            order_type = rng.choices(["dine-in", "pickup", "delivery"], weights=[5, 3, 2])[0]
+
+            subtotal = 0.0
+            for _ in range(rng.choice([1, 1, 2, 2, 2, 3, 3, 4, 5])):
+                item_id, _, price, _ = rng.choice(menu)
+                quantity = rng.choice([1, 1, 1, 2, 2, 3])
+                line_id += 1
+                subtotal += price * quantity
+                order_lines.append({"id": line_id, "order_id": order_id, "menu_item_id": item_id,
+                                    "quantity": quantity, "price_at_time": price})
+            delivery_fee = 30.0 if order_type == "delivery" and subtotal < 280.0 else 0.0
+
+            accepted_at = prepared_at = delivered_at = None
+            if status != OrderStatus.PENDING and status != OrderStatus.CANCELLED:
+                accepted_at = created_at + timedelta(seconds=rng.randrange(30, 600))
+                if status != OrderStatus.PREPARING:
+                    prepared_at = accepted_at + timedelta(seconds=rng.randrange(300, 2400))
+                if status == OrderStatus.COMPLETED:
+                    delivered_at = prepared_at + timedelta(seconds=rng.randrange(60, 2700 if order_type == "delivery" else 600))
+
+            yield {
+                "id": order_id,
+                "user_id": rng.randrange(1, n_users + 1) if n_users and rng.random() < 0.6 else None,
+                "customer_name": f"Customer {order_id}", "customer_phone": f"07{order_id:08d}",
+                "order_type": order_type, "status": status.value, "total": subtotal + delivery_fee,
+                "delivery_fee": delivery_fee,
+                "address": "12 Vilakazi St, Soweto" if order_type == "delivery" else None,
+                "instructions": None,
+                "table_number": str(rng.randrange(1, 25)) if order_type == "dine-in" else None,
+                "created_at": created_at, "accepted_at": accepted_at, "prepared_at": prepared_at,
+                "delivered_at": delivered_at,
+                "assigned_staff_id": rng.randrange(1, n_staff + 1) if accepted_at else None,
+            }
+
+    def flush_lines():
+        counts["order_items"] = counts.get("order_items", 0) + load(engine, OrderItem, order_lines)
+        order_lines.clear()
+
+    def orders_then_lines():
+        # Lines are buffered and written right after the batch of orders they belong to
+        for batch in batched(orders()):
+            yield from batch
+            if len(order_lines) >= BATCH_SIZE:
+                flush_lines()
+
+    step("orders", Order, orders_then_lines())
+    started = time.perf_counter()
+    flush_lines()
+    print(f"{'order_items':<16} {counts['order_items']:>10,} rows  {time.perf_counter() - started:6.1f}s", flush=True)
+
+    step("reviews", Review, (
+        {"id": i, "user_id": user_id, "guest_name": None if user_id else f"Guest {i}",
+         "stars": rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 3, 6, 9])[0],
+         "text": rng.choice(REVIEW_TEXTS), "created_at": random_moment(rng, start, now)}
+        for i, user_id in ((i, rng.randrange(1, n_users + 1) if n_users and rng.random() < 0.7 else None)
+                           for i in range(1, n_reviews + 1))
+    ))
+
+    def likes():
+        like_id = 0
+        for review_id in range(1, n_reviews + 1):
+            for user_id in rng.sample(range(1, n_users + 1), min(n_users, int(rng.expovariate(0.5)))):
+                like_id += 1
+                yield {"id": like_id, "review_id": review_id, "user_id": user_id}
+
+    step("review_likes", ReviewLike, likes())
+
+    def comments():
+        comment_id = 0
+        for review_id in range(1, n_reviews + 1):
+            for _ in range(int(rng.expovariate(2))):
+                comment_id += 1
+                user_id = rng.randrange(1, n_users + 1) if n_users and rng.random() < 0.8 else None
+                yield {"id": comment_id, "review_id": review_id, "user_id": user_id,
+                       "guest_name": None if user_id else "Guest", "text": rng.choice(REVIEW_TEXTS),
+                       "created_at": random_moment(rng, start, now)}
+
+    step("review_comments", ReviewComment, comments())
+    step("review_images", ReviewImage, (
+        {"review_id": review_id, "image_url": f"/assets/images/reviews/bench-{review_id}.jpg"}
+        for review_id in range(1, n_reviews + 1) if rng.random() < 0.1
+    ))
+
+    days = [start.date() + timedelta(days=d) for d in range((now.date() - start.date()).days + 1)]
+    step("attendance", Attendance, (
+        {"staff_id": staff_id, "date": datetime.combine(day, datetime.min.time()).replace(hour=8),
+         "day": day, "status": "present" if rng.random() < 0.85 else "off"}
+        for day in days for staff_id in range(1, n_staff + 1)
+    ))
+
+    step("expenses", Expense, (
+        {"category": category, "amount": round(rng.uniform(*EXPENSE_CATEGORIES[category]), 2),
+         "description": f"{category} {day.isoformat()}",
+         "date": datetime.combine(day, datetime.min.time()).replace(hour=rng.randrange(7, 20))}
+        for day in days for category in rng.sample(list(EXPENSE_CATEGORIES), rng.randrange(1, 5))
+    ))
+
+    months = sorted({(day.year, day.month) for day in days})
+    step("budgets", Budget, (
+        {"month": month, "year": year, "category": category, "allocated_amount": high * 25}
+        for year, month in months for category, (_, high) in EXPENSE_CATEGORIES.items()
+    ))
+
+    step("tasks", Task, (
+        {"title": f"Task {i}", "description": None,
+         "due_time": now + timedelta(hours=rng.randrange(-24 * 60, 24 * 14)),
+         "is_completed": rng.random() < 0.7, "assigned_staff_id": rng.randrange(1, n_staff + 1),
+         "created_at": now - timedelta(days=rng.randrange(0, 60))}
+        for i in range(int(20_000 * max(scale, 0.05)))
+    ))
+    step("milestones", Milestone, (
+        {"title": f"Milestone {i}", "description": None,
+         "deadline": now + timedelta(days=rng.randrange(-365, 365)), "progress_status": "In Progress",
+         "assigned_staff_id": rng.randrange(1, n_staff + 1), "is_completed": rng.random() < 0.5,
+         "milestone_type": rng.choice(["weekly", "monthly", "yearly"]), "created_at": start}
+        for i in range(int(2_000 * max(scale, 0.05)))
+    ))
+
+    with Session(engine) as db:
+        started = time.perf_counter()
+        rows = analytics_service.backfill_menu_item_sales(db)["rows"]
+        print(f"{'menu_item_sales':<16} {rows:>10,} rows  {time.perf_counter() - started:6.1f}s", flush=True)
+
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+    engine.dispose()
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.database_url, args.scale, args.years, args.seed)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
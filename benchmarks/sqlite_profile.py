@@ -0,0 +1,88 @@
+"""Compare SQLite read/write throughput with and without the performance PRAGMA profile.
+
+    python -m benchmarks.sqlite_profile [--writers 4] [--readers 4] [--seconds 5]
+
+Each run uses a fresh on-disk database: writer threads commit single-order transactions
+while reader threads run the dashboard-style aggregates against the same file.
+"""
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.exc import OperationalError
+from app.database.database import Base, configure_sqlite
+from app.models.models import Order
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+def run(profile: bool, writers: int, readers: int, seconds: float):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=writers + readers
+    )
+    if profile:
+        configure_sqlite(engine)
+    Base.metadata.create_all(bind=engine)
+
+    counts = {"writes": 0, "reads": 0, "lock_errors": 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer():
+        while time.monotonic() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(Order).values(
+                        customer_name="bench", customer_phone="0", order_type="pickup",
+                        status="pending", total=100.0, delivery_fee=0.0
+                    ))
+                bump("writes")
+            except OperationalError:
+                bump("lock_errors")
+
+    def reader():
+        while time.monotonic() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(select(func.count(Order.id), func.sum(Order.total)).where(Order.status != "cancelled")).one()
+                bump("reads")
+            except OperationalError:
+                bump("lock_errors")
+
+    threads = [threading.Thread(target=writer) for _ in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    return {
+        "profile": "performance" if profile else "default",
+        "writes_per_sec": round(counts["writes"] / seconds, 1),
+        "reads_per_sec": round(counts["reads"] / seconds, 1),
+        "lock_errors": counts["lock_errors"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for profile in (False, True):
+        result = run(profile, args.writers, args.readers, args.seconds)
+        print(
+            f"{result['profile']:<12} writes/s={result['writes_per_sec']:<10} "
+            f"reads/s={result['reads_per_sec']:<10} lock_errors={result['lock_errors']}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Measure how long the app takes to import, to start serving under app.serve, and to drain.
+
+    python -m benchmarks.startup [--runs 5] [--workers 1,2,4] [--port 8765]
+
+Runs against a fresh migrated SQLite database. "import" is `import main` in a new
+interpreter; "ready" is launch of `python -m app.serve` until /health answers (schema check
+and directory setup included); "drain" is SIGTERM until the parent process exits. Run from the
+repository root.
+"""
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+from benchmarks.common import percentile
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import main; print(time.perf_counter() - started)"
+
+def migrate(url: str):
+    from alembic import command
+    from alembic.config import Config
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, "head")
+
+def time_import(env: dict):
+    output = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+def time_serve(env: dict, workers: int, port: int, timeout: float = 60.0):
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.serve", "--workers", str(workers), "--port", str(port), "--log-level", "warning"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"app.serve exited with {process.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError("app.serve did not become ready")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.02)
+        ready = time.perf_counter() - started
+
+        stopping = time.perf_counter()
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=timeout)
+        return ready, time.perf_counter() - stopping
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+def summary(label: str, values):
+    return (
+        f"{label:<16} p50={percentile(values, 0.5) * 1000:>8.1f}ms "
+        f"max={max(values) * 1000:>8.1f}ms runs={len(values)}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "startup.db")
+    migrate(url)
+    env = {**os.environ, "DATABASE_URL": url}
+
+    print(summary("import", [time_import(env) for _ in range(args.runs)]), flush=True)
+    for workers in (int(w) for w in args.workers.split(",")):
+        results = [time_serve(env, workers, args.port) for _ in range(args.runs)]
+        print(summary(f"ready w={workers}", [ready for ready, _ in results]), flush=True)
+        print(summary(f"drain w={workers}", [drain for _, drain in results]), flush=True)
+
+if __name__ == "__main__":
+    main()
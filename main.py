@@ -1,16 +1,58 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from app.api import auth, orders, admin, reviews
-from app.database.database import engine, Base
+from app.api import auth, orders, admin, reviews, metrics
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.etag import ETagMiddleware
+from app.static_files import (
+    ACCEPT_CH, PrecompressedStaticFiles, ResponsiveImageFiles, STATIC_BUILD_DIR, resolve_built, static_response
+)
 import os
 
-# Create tables on startup (if not using Alembic)
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic: run `alembic upgrade head` before starting the app, or start it
+# with `python -m app.serve --migrate` (see README)
 
 app = FastAPI(title="Malume Nico API", version="1.0.0")
 
+# Weak ETags and 304s for JSON reads; innermost, so the stats and metrics below see the 304s
+app.add_middleware(ETagMiddleware, path_prefixes=("/reviews/feed", "/orders/", "/admin/", "/auth/me"))
+
+# Per-request SQL stats. Budgets are the most queries each route should need, plus two for
+# a cold principal lookup and the periodic revocation filter rebuild
+app.add_middleware(
+    QueryStatsMiddleware,
+    query_budgets={
+        ("GET", "/reviews/feed"): 10,
+        ("GET", "/admin/staff"): 4,
+        ("GET", "/admin/dashboard/stats"): 3,
+        ("GET", "/admin/orders"): 4,
+        ("GET", "/orders/status/{order_id}"): 4,
+        ("GET", "/orders/user"): 5,
+        ("POST", "/orders/create"): 8,
+    },
+)
+
+# Rate limiting sits inside CORS so 429/503 responses still carry CORS headers
+app.add_middleware(
+    RateLimitMiddleware,
+    route_limits={
+        # (tokens per second, burst)
+        ("POST", "/auth/login"): (5 / 60, 5),
+        ("POST", "/auth/register"): (5 / 60, 5),
+        ("POST", "/auth/refresh"): (30 / 60, 10),
+        ("POST", "/reviews/submit"): (3 / 60, 3),
+        ("POST", "/orders/create"): (10 / 60, 5),
+        ("POST", "/orders/guest-create"): (10 / 60, 5),
+    },
+    # Static mounts and HTML pages use the separate static bucket
+    static_prefixes=("/assets/", "/images/", "/admin/css/"),
+    static_suffixes=("/", ".html"),
+)
+
+# Outside the rate limiter so 429/503 responses are counted too
+app.add_middleware(MetricsMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -25,30 +67,40 @@ app.include_router(auth.router)
 app.include_router(orders.router)
 app.include_router(admin.router)
 app.include_router(reviews.router)
+app.include_router(metrics.router)
 
-# Mount static files for images
-if not os.path.exists("assets/images/reviews"):
-    os.makedirs("assets/images/reviews", exist_ok=True)
-app.mount("/assets/images/reviews", StaticFiles(directory="assets/images/reviews"), name="reviews")
-app.mount("/assets", StaticFiles(directory="assets"), name="assets")
-app.mount("/admin", StaticFiles(directory="admin"), name="admin")
-app.mount("/images", StaticFiles(directory="images"), name="images")
+# Static files. Uploaded review images (assets/images/reviews) are served by the /assets mount;
+# `python -m app.serve` creates that directory before starting workers
+# Fingerprinted and precompressed copies from `python -m app.static_build` shadow the sources;
+# images are swapped for the best variant from `python -m app.image_build` when one exists
+app.mount("/assets", ResponsiveImageFiles(
+    directory="assets", build_directory=os.path.join(STATIC_BUILD_DIR, "assets")
+), name="assets")
+app.mount("/admin", PrecompressedStaticFiles(
+    directory="admin", build_directory=os.path.join(STATIC_BUILD_DIR, "admin")
+), name="admin")
+app.mount("/images", ResponsiveImageFiles(directory="images"), name="images")
 
 @app.get("/api")
 def read_api_root():
     return {"message": "Welcome to Malume Nico Backend API"}
 
-@app.get("/", response_class=FileResponse)
-async def read_index():
-    return FileResponse("index.html")
+def _page_response(file_path: str, request: Request):
+    response = static_response(resolve_built(file_path), request.headers)
+    response.headers["accept-ch"] = ACCEPT_CH
+    return response
+
+@app.get("/")
+async def read_index(request: Request):
+    return _page_response("index.html", request)
 
 @app.get("/{page}.html")
-async def read_page(page: str):
+async def read_page(page: str, request: Request):
     file_path = f"{page}.html"
     # List of allowed HTML files to serve from root
     allowed_pages = ["index", "comments", "profile", "booking", "coupons", "menu", "coupon"]
     if page in allowed_pages and os.path.isfile(file_path):
-        return FileResponse(file_path)
+        return _page_response(file_path, request)
     raise HTTPException(status_code=404)
 
 @app.get("/health")
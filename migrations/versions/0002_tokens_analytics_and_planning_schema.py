@@ -0,0 +1,147 @@
+"""tokens, analytics and planning schema
+
+Refresh/revoked token tables, the menu sales and staff performance rollups, attendance.day
+with one row per staff member per day, and the task/milestone board indexes. Databases
+created by create_all from newer models may already have some of these, so each step
+checks first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def _has_table(name: str) -> bool:
+    return _inspector().has_table(name)
+
+
+def _has_column(table: str, column: str) -> bool:
+    return column in {c['name'] for c in _inspector().get_columns(table)}
+
+
+def _has_index(table: str, name: str) -> bool:
+    return name in {i['name'] for i in _inspector().get_indexes(table)}
+
+
+def _create_index(name: str, table: str, columns: list, unique: bool = False) -> None:
+    if not _has_index(table, name):
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _has_table('revoked_tokens'):
+        op.create_table('revoked_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'], unique=False)
+        op.create_index('ix_revoked_tokens_id', 'revoked_tokens', ['id'], unique=False)
+        op.create_index('ix_revoked_tokens_key', 'revoked_tokens', ['key'], unique=True)
+
+    if not _has_table('refresh_tokens'):
+        op.create_table('refresh_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_hash', sa.String(), nullable=False),
+        sa.Column('family_id', sa.String(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_refresh_tokens_family_id', 'refresh_tokens', ['family_id'], unique=False)
+        op.create_index('ix_refresh_tokens_id', 'refresh_tokens', ['id'], unique=False)
+        op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+        op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+
+    if not _has_table('menu_item_daily_sales'):
+        op.create_table('menu_item_daily_sales',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('menu_item_id', 'day', name='uq_menu_item_daily_sales_item_day')
+        )
+        op.create_index('ix_menu_item_daily_sales_day', 'menu_item_daily_sales', ['day'], unique=False)
+        op.create_index('ix_menu_item_daily_sales_id', 'menu_item_daily_sales', ['id'], unique=False)
+
+    if not _has_table('staff_performance_cache'):
+        op.create_table('staff_performance_cache',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('payload', sa.Text(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('day')
+        )
+
+    if not _has_column('attendance', 'day'):
+        with op.batch_alter_table('attendance', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('day', sa.Date(), nullable=True))
+
+        # Backfill from the timestamp and keep only the latest mark per staff member per day
+        op.execute("UPDATE attendance SET day = date(date)")
+        op.execute(
+            "DELETE FROM attendance WHERE id NOT IN "
+            "(SELECT max_id FROM (SELECT MAX(id) AS max_id FROM attendance GROUP BY staff_id, day) AS latest)"
+        )
+
+        with op.batch_alter_table('attendance', schema=None) as batch_op:
+            batch_op.alter_column('day', existing_type=sa.Date(), nullable=False, server_default=sa.func.current_date())
+            batch_op.create_unique_constraint('uq_attendance_staff_id_day', ['staff_id', 'day'])
+
+    _create_index('ix_attendance_staff_id_date', 'attendance', ['staff_id', 'date'])
+    _create_index('ix_milestones_assigned_staff_id_is_completed', 'milestones', ['assigned_staff_id', 'is_completed'])
+    _create_index('ix_milestones_is_completed_deadline', 'milestones', ['is_completed', 'deadline'])
+    _create_index('ix_tasks_assigned_staff_id_is_completed', 'tasks', ['assigned_staff_id', 'is_completed'])
+    _create_index('ix_tasks_is_completed_due_time', 'tasks', ['is_completed', 'due_time'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_is_completed_due_time', table_name='tasks')
+    op.drop_index('ix_tasks_assigned_staff_id_is_completed', table_name='tasks')
+    op.drop_index('ix_milestones_is_completed_deadline', table_name='milestones')
+    op.drop_index('ix_milestones_assigned_staff_id_is_completed', table_name='milestones')
+    op.drop_index('ix_attendance_staff_id_date', table_name='attendance')
+
+    with op.batch_alter_table('attendance', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_attendance_staff_id_day', type_='unique')
+        batch_op.drop_column('day')
+
+    op.drop_table('staff_performance_cache')
+    op.drop_index('ix_menu_item_daily_sales_id', table_name='menu_item_daily_sales')
+    op.drop_index('ix_menu_item_daily_sales_day', table_name='menu_item_daily_sales')
+    op.drop_table('menu_item_daily_sales')
+    op.drop_index('ix_refresh_tokens_user_id', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_id', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_family_id', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
+    op.drop_index('ix_revoked_tokens_key', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_id', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
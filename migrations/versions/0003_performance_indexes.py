@@ -0,0 +1,46 @@
+"""performance indexes
+
+Indexes for the hottest filters: order listings and reports by date, status and user,
+order lines by order, the review feed's per-review likes, comments and images, and
+expense reports by date and category.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False)
+    op.create_index('ix_orders_status', 'orders', ['status'], unique=False)
+    op.create_index('ix_orders_user_id', 'orders', ['user_id'], unique=False)
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+    op.create_index('ix_review_likes_review_id_user_id', 'review_likes', ['review_id', 'user_id'], unique=False)
+    op.create_index('ix_review_comments_review_id', 'review_comments', ['review_id'], unique=False)
+    op.create_index('ix_review_images_review_id', 'review_images', ['review_id'], unique=False)
+    op.create_index('ix_expenses_date_category', 'expenses', ['date', 'category'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_expenses_date_category', table_name='expenses')
+    op.drop_index('ix_review_images_review_id', table_name='review_images')
+    op.drop_index('ix_review_comments_review_id', table_name='review_comments')
+    op.drop_index('ix_review_likes_review_id_user_id', table_name='review_likes')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_user_id', table_name='orders')
+    op.drop_index('ix_orders_status', table_name='orders')
+    op.drop_index('ix_orders_created_at', table_name='orders')
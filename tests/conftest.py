@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The app reads its configuration at import time: point it at a throwaway SQLite file, turn rate
+# limiting off (its tests build their own middleware) and fail requests that go over their query budget
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="malume-nico-tests-"), "test.db")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+os.environ["SQL_QUERY_BUDGET_ENFORCE"] = "true"
+os.environ["ETAG_ENABLED"] = "true"
+# Static and image mounts are relative to the repository root
+os.chdir(ROOT)
+sys.path.insert(0, ROOT)
+
+from alembic import command
+from alembic.config import Config
+
+command.upgrade(Config(os.path.join(ROOT, "alembic.ini")), "head")
+
+from fastapi.testclient import TestClient
+import main
+from app.auth import deps, security
+from app.auth.revocation import revocation_filter
+from app.database.database import Base, SessionLocal, engine
+from app.models.models import User
+
+@pytest.fixture(scope="session")
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    # Loaded up front so the first request of a test does not count the filter load
+    revocation_filter.rebuild()
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    deps.principal_cache.discard_where(lambda principal: True)
+    deps._invalidated_users.clear()
+    revocation_filter.rebuild()
+
+def make_user(db, email: str, role: str = "customer", full_name: str = None):
+    user = User(email=email, hashed_password="x", role=role, full_name=full_name or email.split("@")[0])
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+def auth_headers(user: User):
+    token = security.create_access_token({"sub": user.email, "uid": user.id, "role": user.role})
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def admin(db):
+    return make_user(db, "admin@example.com", role="admin")
+
+@pytest.fixture
+def admin_headers(admin):
+    return auth_headers(admin)
+
+def query_count(response):
+    # From the Server-Timing header set by QueryStatsMiddleware: db;dur=..;desc="N queries"
+    timing = response.headers["server-timing"]
+    return int(timing.split('desc="', 1)[1].split(" ", 1)[0])
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+
+from app.models.models import ArchivedOrder, ArchivedOrderItem, MenuItem, Order, OrderItem
+
+def _seed_old_orders(db):
+    item = MenuItem(name="Kota", price=45.0, category="mains")
+    db.add(item)
+    db.commit()
+    old = datetime.now() - timedelta(days=40)
+    statuses = ["completed", "cancelled", "completed", "pending", "completed"]
+    orders = []
+    for status in statuses:
+        order = Order(
+            customer_name="Thandi", customer_phone="0820000000", order_type="pickup",
+            status=status, total=90.0, created_at=old
+        )
+        order.items = [OrderItem(menu_item_id=item.id, quantity=2, price_at_time=45.0)]
+        orders.append(order)
+    db.add_all(orders)
+    db.commit()
+    return item, [order.id for order in orders]
+
+def test_archive_moves_old_orders_and_keeps_the_newest_live(client, db, admin_headers):
+    item, order_ids = _seed_old_orders(db)
+
+    response = client.post("/admin/orders/archive", params={"older_than_days": 35, "batch_size": 2}, headers=admin_headers)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["archived_orders"] == 3 and result["archived_items"] == 3
+    assert result["batches"] == 2 and not result["has_more"]
+
+    db.expire_all()
+    # Pending orders are never archived; the newest order holds the top rowids, so it stays
+    # live even though it is old enough
+    assert sorted(o.id for o in db.query(Order).all()) == [order_ids[3], order_ids[4]]
+    assert sorted(o.id for o in db.query(ArchivedOrder).all()) == order_ids[:3]
+    assert sorted(i.order_id for i in db.query(ArchivedOrderItem).all()) == order_ids[:3]
+    assert db.query(OrderItem).count() == 2
+
+    # Archived orders are still readable by id, and new ids never collide with archived ones
+    assert client.get(f"/orders/status/{order_ids[0]}").json()["status"] == "completed"
+    response = client.post("/orders/guest-create", json={
+        "customer_name": "Sipho", "customer_phone": "0830000000", "order_type": "pickup",
+        "items": [{"menu_item_id": item.id, "quantity": 1}]
+    })
+    assert response.json()["id"] > max(order_ids)
+
+def test_archive_leaves_dashboard_stats_unchanged(client, db, admin_headers):
+    _seed_old_orders(db)
+    before = client.get("/admin/dashboard/stats", headers=admin_headers).json()
+    assert before["completed_orders"] == 3
+
+    assert client.post("/admin/orders/archive", params={"older_than_days": 35}, headers=admin_headers).json()["archived_orders"] == 3
+    assert client.get("/admin/dashboard/stats", headers=admin_headers).json() == before
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+from app.models.models import Budget, Expense, Order, Staff
+from conftest import query_count
+
+def _order(total, status, created_at):
+    return Order(
+        customer_name="a", customer_phone="1", order_type="pickup", status=status, total=total, created_at=created_at
+    )
+
+def test_finance_report_totals_and_budgets_in_one_query(client, db, admin_headers):
+    now = datetime.now()
+    last_month = now.replace(day=1) - timedelta(days=1)
+    db.add_all([
+        _order(100.0, "completed", now),
+        _order(50.0, "completed", now),
+        _order(70.0, "cancelled", now),
+        _order(999.0, "completed", last_month),
+        Expense(category="Supplies", amount=30.0, date=now),
+        Expense(category="Supplies", amount=20.0, date=now),
+        Expense(category="Gas", amount=10.0, date=now),
+        Expense(category="Supplies", amount=500.0, date=last_month),
+        Staff(name="S", role="chef", salary=40.0),
+        Staff(name="T", role="chef", salary=900.0, employment_status="inactive"),
+        Budget(month=now.month, year=now.year, category="Supplies", allocated_amount=100.0),
+        Budget(month=now.month, year=now.year, category="Rent", allocated_amount=300.0),
+        Budget(month=last_month.month, year=last_month.year, category="Gas", allocated_amount=5.0),
+    ])
+    db.commit()
+
+    response = client.get("/admin/finance/report", headers=admin_headers)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["monthly_revenue"] == 150.0
+    assert report["monthly_expenses"] == 100.0   # 60 of expenses plus 40 of active salaries
+    assert report["estimated_profit"] == 50.0
+    assert [(b["category"], b["spent"], b["remaining"]) for b in report["budgets"]] == [
+        ("Supplies", 50.0, 50.0), ("Rent", 0.0, 300.0)
+    ]
+    assert query_count(response) == 1
+
+    summary = client.get("/admin/finance/summary", headers=admin_headers).json()
+    assert summary == {"total_income": 150.0, "total_expenses": 100.0, "estimated_profit": 50.0}
+
+def test_finance_report_without_budgets(client, admin_headers):
+    report = client.get("/admin/finance/report", headers=admin_headers).json()
+    assert report == {"monthly_revenue": 0.0, "monthly_expenses": 0.0, "estimated_profit": 0.0, "budgets": []}
+
+def test_expense_cursor_pages_cover_every_row_once(client, db, admin_headers):
+    day = datetime(2025, 3, 1)
+    # Several expenses share a date, so the keyset has to break ties on id
+    db.add_all([Expense(category="Supplies", amount=float(i), date=day + timedelta(days=i // 3)) for i in range(10)])
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        url = "/admin/finance/expenses?limit=4" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=admin_headers).json()
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert len(seen) == 10
+    assert len({e["id"] for e in seen}) == 10
+    keys = [(e["date"], e["id"]) for e in seen]
+    assert keys == sorted(keys, reverse=True)
@@ -0,0 +1,57 @@
+import logging
+
+from sqlalchemy import select
+
+from app.models.models import MenuItem, MenuItemDailySales
+
+def _menu(db):
+    items = [MenuItem(name="Kota", price=45.0, category="mains"), MenuItem(name="Vetkoek", price=15.0, category="sides")]
+    db.add_all(items)
+    db.commit()
+    return items
+
+def _place_order(client, kota, vetkoek):
+    response = client.post("/orders/guest-create", json={
+        "customer_name": "Thandi",
+        "customer_phone": "0820000000",
+        "order_type": "pickup",
+        "items": [{"menu_item_id": kota.id, "quantity": 2}, {"menu_item_id": vetkoek.id, "quantity": 3}]
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def _counters(db):
+    db.expire_all()
+    rows = db.execute(select(MenuItemDailySales)).scalars().all()
+    return {row.menu_item_id: (row.quantity, row.revenue, row.order_count) for row in rows}
+
+def test_cancel_reverses_counters(client, db, admin_headers, caplog):
+    kota, vetkoek = _menu(db)
+    order_id = _place_order(client, kota, vetkoek)
+    assert _counters(db) == {kota.id: (2, 90.0, 1), vetkoek.id: (3, 45.0, 1)}
+
+    with caplog.at_level(logging.WARNING, logger="app.analytics"):
+        response = client.patch(f"/admin/orders/update/{order_id}", params={"status": "cancelled"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert _counters(db) == {kota.id: (0, 0.0, 0), vetkoek.id: (0, 0.0, 0)}
+    assert not caplog.records
+
+    # Un-cancelling counts the order again
+    client.patch(f"/admin/orders/update/{order_id}", params={"status": "pending"}, headers=admin_headers)
+    assert _counters(db) == {kota.id: (2, 90.0, 1), vetkoek.id: (3, 45.0, 1)}
+
+def test_cancel_of_uncounted_order_clamps_at_zero_and_warns(client, db, admin_headers, caplog):
+    kota, vetkoek = _menu(db)
+    order_id = _place_order(client, kota, vetkoek)
+    # As if the order predated the counters: one bucket missing, the other short
+    db.execute(MenuItemDailySales.__table__.delete().where(MenuItemDailySales.menu_item_id == kota.id))
+    db.execute(MenuItemDailySales.__table__.update().values(quantity=1, revenue=15.0))
+    db.commit()
+
+    with caplog.at_level(logging.WARNING, logger="app.analytics"):
+        response = client.patch(f"/admin/orders/update/{order_id}", params={"status": "cancelled"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert _counters(db) == {vetkoek.id: (0, 0.0, 0)}
+    assert len(caplog.records) == 1
+    assert "backfill" in caplog.records[0].getMessage()
+    assert str([kota.id, vetkoek.id]) in caplog.records[0].getMessage()
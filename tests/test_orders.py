@@ -0,0 +1,42 @@
+from app.models.models import MenuItem
+
+def _place_order(client, db, order_type="pickup"):
+    item = MenuItem(name="Kota", price=45.0, category="mains")
+    db.add(item)
+    db.commit()
+    response = client.post("/orders/guest-create", json={
+        "customer_name": "Thandi", "customer_phone": "0820000000", "order_type": order_type,
+        "items": [{"menu_item_id": item.id, "quantity": 2}]
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def test_status_update_stamps_each_stage(client, db, admin_headers):
+    order = _place_order(client, db)
+    assert order["status"] == "pending" and order["total"] == 90.0
+
+    for status, stamp in (("preparing", "accepted_at"), ("ready", "prepared_at"), ("completed", "delivered_at")):
+        response = client.patch(f"/admin/orders/update/{order['id']}", params={"status": status}, headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["status"] == status
+        assert response.json()[stamp] is not None
+
+    status = client.get(f"/orders/status/{order['id']}").json()
+    assert status["status"] == "completed"
+    assert all(status[stamp] for stamp in ("accepted_at", "prepared_at", "delivered_at"))
+
+def test_status_update_of_missing_order_is_404(client, admin_headers):
+    response = client.patch("/admin/orders/update/999", params={"status": "ready"}, headers=admin_headers)
+    assert response.status_code == 404
+
+def test_dashboard_stats(client, db, admin_headers):
+    # The delivery order carries the delivery fee on top of its 90.00
+    first = _place_order(client, db, order_type="delivery")
+    _place_order(client, db)
+    client.patch(f"/admin/orders/update/{first['id']}", params={"status": "completed"}, headers=admin_headers)
+
+    stats = client.get("/admin/dashboard/stats", headers=admin_headers).json()
+    assert stats == {
+        "monthly_revenue": 210.0, "daily_revenue": 210.0, "orders_count": 2,
+        "pending_orders": 1, "completed_orders": 1, "delivery_orders": 1
+    }
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app.models.models import Milestone, Task
+
+def _pages(client, headers, url):
+    items, cursor = [], None
+    while True:
+        page = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers).json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items
+
+def test_task_cursor_orders_by_due_with_undated_last(client, db, admin_headers):
+    start = datetime(2030, 1, 1, 9)
+    # Shared due times and several undated tasks, so both halves of the keyset are crossed
+    db.add_all([Task(title=f"t{i}", due_time=start + timedelta(hours=i // 2)) for i in range(7)])
+    db.add_all([Task(title=f"u{i}") for i in range(4)])
+    db.commit()
+
+    tasks = _pages(client, admin_headers, "/admin/tasks?limit=3")
+    assert len(tasks) == 11 and len({t["id"] for t in tasks}) == 11
+    dated = [(t["due_time"], t["id"]) for t in tasks[:7]]
+    assert dated == sorted(dated)
+    assert [t["due_time"] for t in tasks[7:]] == [None] * 4
+    assert [t["id"] for t in tasks[7:]] == sorted(t["id"] for t in tasks[7:])
+
+def test_overdue_false_keeps_undated_open_items(client, db, admin_headers):
+    now = datetime.now()
+    db.add_all([
+        Task(title="undated"),
+        Task(title="late", due_time=now - timedelta(days=1)),
+        Task(title="late but done", due_time=now - timedelta(days=1), is_completed=True),
+        Task(title="upcoming", due_time=now + timedelta(days=1)),
+        Milestone(title="undated", milestone_type="weekly"),
+        Milestone(title="late", milestone_type="weekly", deadline=now - timedelta(days=1)),
+    ])
+    db.commit()
+
+    not_overdue = client.get("/admin/tasks?overdue=false", headers=admin_headers).json()["items"]
+    overdue = client.get("/admin/tasks?overdue=true", headers=admin_headers).json()["items"]
+    assert sorted(t["title"] for t in not_overdue) == ["late but done", "undated", "upcoming"]
+    assert [t["title"] for t in overdue] == ["late"]
+
+    milestones = client.get("/admin/milestones?overdue=false", headers=admin_headers).json()["items"]
+    assert [m["title"] for m in milestones] == ["undated"]
+
+def test_upcoming_open_tasks_page_past_today(client, db, admin_headers):
+    tomorrow = datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+    db.add_all([Task(title=f"later{i}", due_time=tomorrow + timedelta(days=i)) for i in range(5)])
+    db.add_all([Task(title="today", due_time=tomorrow - timedelta(hours=1)), Task(title="done", due_time=tomorrow, is_completed=True)])
+    db.commit()
+
+    upcoming = _pages(
+        client, admin_headers, f"/admin/tasks?is_completed=false&due_after={tomorrow.isoformat()}&limit=2"
+    )
+    assert [t["title"] for t in upcoming] == [f"later{i}" for i in range(5)]
@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+
+import main
+from app.middleware import query_stats
+from app.middleware.query_stats import QueryBudgetExceeded, QueryStatsMiddleware
+from app.models.models import Attendance, Review, ReviewComment, ReviewImage, ReviewLike, Staff
+from conftest import auth_headers, make_user, query_count
+
+@pytest.fixture
+def query_budgets():
+    middleware = next(m for m in main.app.user_middleware if m.cls is QueryStatsMiddleware)
+    return middleware.kwargs["query_budgets"]
+
+def _seed_reviews(db):
+    users = [make_user(db, f"reviewer{i}@example.com") for i in range(3)]
+    for i in range(12):
+        review = Review(user_id=users[i % 3].id if i % 2 else None, guest_name=None if i % 2 else "Guest", stars=5, text=f"Review {i}")
+        review.likes = [ReviewLike(user_id=user.id) for user in users[: i % 4]]
+        review.comments = [ReviewComment(user_id=users[0].id, text="Agreed"), ReviewComment(guest_name="Guest", text="Yes")]
+        review.images = [ReviewImage(image_url=f"/images/review-{i}.jpg")]
+        db.add(review)
+    db.commit()
+    return users
+
+def _seed_staff(db):
+    for i in range(4):
+        staff = Staff(name=f"Staff {i}", role="chef", salary=100.0)
+        staff.attendance = [
+            Attendance(status="present", day=date(2026, 10, 1)),
+            Attendance(status="off", day=date(2026, 10, 2)),
+        ]
+        db.add(staff)
+    db.commit()
+
+def test_feed_and_staff_stay_within_budget(client, db, admin_headers, query_budgets):
+    users = _seed_reviews(db)
+    _seed_staff(db)
+
+    response = client.get("/reviews/feed", params={"limit": 10}, headers=auth_headers(users[0]))
+    assert response.status_code == 200
+    assert len(response.json()["reviews"]) == 10
+    assert query_count(response) <= query_budgets[("GET", "/reviews/feed")]
+
+    response = client.get("/admin/staff", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 4
+    assert query_count(response) <= query_budgets[("GET", "/admin/staff")]
+
+def test_going_over_budget_fails_the_request(client, db, admin_headers, query_budgets, monkeypatch):
+    _seed_staff(db)
+    monkeypatch.setattr(query_stats, "SQL_QUERY_BUDGET_ENFORCE", True)
+    monkeypatch.setitem(query_budgets, ("GET", "/admin/staff"), 1)
+    with pytest.raises(QueryBudgetExceeded, match="GET /admin/staff ran .* queries, budget is 1"):
+        client.get("/admin/staff", headers=admin_headers)
@@ -0,0 +1,66 @@
+from fastapi.testclient import TestClient
+
+from app.middleware import rate_limit
+from app.middleware.rate_limit import RateLimitMiddleware, TokenBuckets
+
+def test_bucket_refills_at_rate_up_to_burst():
+    buckets = TokenBuckets()
+    assert buckets.take("a", rate=2, burst=2, now=0) == (True, 0)
+    assert buckets.take("a", rate=2, burst=2, now=0) == (True, 0)
+    assert buckets.take("a", rate=2, burst=2, now=0) == (False, 0.5)
+    assert buckets.take("a", rate=2, burst=2, now=0.25) == (False, 0.25)
+    assert buckets.take("a", rate=2, burst=2, now=0.5)[0]
+    # A long idle period refills to the burst, no further
+    for _ in range(2):
+        assert buckets.take("a", rate=2, burst=2, now=100)[0]
+    assert not buckets.take("a", rate=2, burst=2, now=100)[0]
+
+def test_eviction_drops_idle_buckets_and_caps_keys():
+    buckets = TokenBuckets(max_keys=3)
+    buckets.take("old", rate=1, burst=5, now=0)
+    buckets.take("recent", rate=1, burst=5, now=8)
+    buckets.evict_idle(now=10, idle_after=5)
+    assert len(buckets) == 1
+
+    for key in ("b", "c", "d"):
+        buckets.take(key, rate=1, burst=5, now=10)
+    buckets.evict_idle(now=10, idle_after=5)
+    # The least recently used bucket goes first
+    assert len(buckets) == 3
+    assert buckets.take("recent", rate=1, burst=5, now=10) == (True, 0)
+    assert len(buckets) == 4
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def test_spoofed_forwarded_for_does_not_get_a_fresh_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_PROXY_HOPS", 1)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_DEFAULT_RATE", 0.001)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_DEFAULT_BURST", 3)
+    client = TestClient(RateLimitMiddleware(_ok))
+
+    # The proxy appends the real peer; anything to its left came from the client
+    statuses = [
+        client.get("/menu", headers={"X-Forwarded-For": f"10.0.0.{i}, 203.0.113.9"}).status_code
+        for i in range(5)
+    ]
+    assert statuses == [200, 200, 200, 429, 429]
+    assert client.get("/menu", headers={"X-Forwarded-For": "203.0.113.10"}).status_code == 200
+
+def test_proxy_hops_counts_from_the_right(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_PROXY", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_PROXY_HOPS", 2)
+    middleware = RateLimitMiddleware(_ok)
+
+    def client_of(*values):
+        return middleware._client({"headers": [(b"x-forwarded-for", v.encode()) for v in values], "client": ("10.9.9.9", 1)})
+
+    assert client_of("1.1.1.1, 203.0.113.9, 10.0.0.2") == "203.0.113.9"
+    # Repeated headers are read as one list
+    assert client_of("1.1.1.1, 203.0.113.9", "10.0.0.2") == "203.0.113.9"
+    # Shorter than the proxy chain: not set by our proxies, use the peer address
+    assert client_of("203.0.113.9") == "10.9.9.9"
@@ -0,0 +1,66 @@
+import calendar
+from datetime import datetime, timedelta
+
+from jose import jwt
+
+from app.auth import security
+from app.auth.revocation import BloomFilter, revocation_filter
+from app.models.models import RefreshToken, RevokedToken
+from app.services import token_service
+from conftest import make_user
+
+def _access_token(user, issued_at: datetime):
+    return jwt.encode({
+        "sub": user.email, "uid": user.id, "role": user.role, "jti": f"jti-{issued_at.timestamp()}",
+        "iat": issued_at, "exp": issued_at + timedelta(minutes=30)
+    }, security.SECRET_KEY, algorithm=security.ALGORITHM)
+
+def test_refresh_rotation_and_reuse_revokes_family(client, db):
+    user = make_user(db, "thabo@example.com")
+    first = token_service.create_session(db, user)["refresh_token"]
+
+    response = client.post("/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 200
+    second = response.json()["refresh_token"]
+    assert second != first
+
+    # Presenting the rotated token again looks like theft: it fails and takes the live one down too
+    assert client.post("/auth/refresh", json={"refresh_token": first}).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": second}).status_code == 401
+    db.expire_all()
+    assert all(token.revoked_at is not None for token in db.query(RefreshToken).all())
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(500, 0.001)
+    keys = [f"jti-{i}" for i in range(500)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+def test_logout_revokes_the_access_token(client, db):
+    user = make_user(db, "lerato@example.com")
+    token = token_service.create_session(db, user)["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", json={}, headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+def test_user_revocation_cuts_off_at_the_second(client, db):
+    user = make_user(db, "sipho@example.com")
+    token_service.revoke_user_access(db, user.id)
+    db.commit()
+    revoked_at = db.query(RevokedToken).one().revoked_at.replace(tzinfo=None)
+    revoked_second = calendar.timegm(revoked_at.utctimetuple())
+
+    assert revocation_filter.is_revoked(None, user.id, revoked_second - 1)
+    # Same second as the revocation, e.g. the login right after a password reset
+    assert not revocation_filter.is_revoked(None, user.id, revoked_second)
+    assert not revocation_filter.is_revoked(None, user.id, revoked_second + 1)
+
+    older = _access_token(user, revoked_at.replace(microsecond=0) - timedelta(seconds=5))
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {older}"}).status_code == 401
+    fresh = token_service.create_session(db, user)["access_token"]
+    assert client.get("/auth/me", headers={"Authorization": f"Bearer {fresh}"}).status_code == 200